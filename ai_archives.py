@@ -6,62 +6,177 @@ A simple wrapper script that makes it easy for AI agents to interact with the Ar
 This eliminates environment activation and path issues by providing direct access to archives functions.
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import subprocess
-import argparse
-from typing import List, Optional
+from functools import lru_cache
 
 # Default server URL (updated to port 5001 to avoid AirPlay conflicts on macOS)
 DEFAULT_SERVER_URL = os.environ.get("ARCHIVES_SERVER_URL", "http://localhost:5001")
 
-def run_command(args: List[str]) -> int:
+# Static copy of the top-level --help output so it can be printed without
+# building the argparse parser (keep in sync with _build_parser)
+USAGE = f"""usage: ai_archives.py [-h] [--server-url SERVER_URL]
+                      {{server,search,add,rule-add,rules,generate,copy-cursorrules,projects,sections,batch}}
+                      ...
+
+AI Archives Wrapper
+
+positional arguments:
+  {{server,search,add,rule-add,rules,generate,copy-cursorrules,projects,sections,batch}}
+                        Command to run
+    server              Start the server
+    search              Search archives
+    add                 Add to archives
+    rule-add            Add/update rule
+    rules               List rules
+    generate            Generate cursorrules file
+    copy-cursorrules    Copy cursorrules file to target directory
+    projects            List all projects
+    sections            List sections for a project
+    batch               Run add/rule-add commands from a JSONL file
+
+options:
+  -h, --help            show this help message and exit
+  --server-url SERVER_URL
+                        Server URL (default: {DEFAULT_SERVER_URL})
+"""
+
+# Resolved once at import instead of on every start_server call
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_SERVER_PATH = os.path.join(_SCRIPT_DIR, "server.py")
+
+# Number of concurrent requests for the batch command (matches the client's connection pool)
+BATCH_WORKERS = 4
+
+# Seconds start_server waits for a new server to answer /ping
+SERVER_START_TIMEOUT = 15
+
+@lru_cache(maxsize=4)
+def _client(server_url: str):
+    """Get a shared ArchivesClient for the given server URL"""
+    from archives_client import ArchivesClient
+    
+    return ArchivesClient(server_url)
+
+def _exit_code(status: int) -> int:
+    """Convert a waitpid() status into a subprocess-style exit code"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+def run_command(args: list[str]) -> int:
     """Run a command and return the exit code"""
+    import shutil
+    import subprocess
+    
     try:
-        return subprocess.call(args)
+        # posix_spawn avoids duplicating the parent's page tables the way
+        # fork()+exec() does; Windows has no posix_spawn so use subprocess there
+        if not hasattr(os, "posix_spawn"):
+            return subprocess.call(args)
+        
+        executable = shutil.which(args[0])
+        if executable is None:
+            print(f"Error executing command: {args[0]} not found")
+            return 1
+        
+        pid = os.posix_spawn(executable, args, os.environ)
+        _, status = os.waitpid(pid, 0)
+        return _exit_code(status)
     except Exception as e:
         print(f"Error executing command: {e}")
         return 1
 
+def _server_running(port: int) -> bool:
+    """Check whether an archives server already answers /ping on the given port"""
+    from urllib.request import urlopen
+    
+    try:
+        with urlopen(f"http://localhost:{port}/ping", timeout=0.5) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
 def start_server(port: int = 5000) -> int:
     """Start the REST API server"""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    server_path = os.path.join(current_dir, "server.py")
+    server_path = _SERVER_PATH
     
     if not os.path.exists(server_path):
         print(f"Error: Server script not found at {server_path}")
         return 1
     
-    # Set environment variable for port
-    env = os.environ.copy()
-    env["PORT"] = str(port)
+    # Reuse a warm server instead of paying interpreter + Flask startup again
+    if _server_running(port):
+        print(f"AI Archives server is already running on port {port}.")
+        print(f"Access at http://localhost:{port}")
+        return 0
     
     print(f"Starting AI Archives server on port {port}...")
     
+    import subprocess
+    import time
+    
     # Start the server as a background process
     try:
-        subprocess.Popen([sys.executable, server_path], env=env)
-        print(f"Server started! Access at http://localhost:{port}")
-        print("Use Ctrl+C to stop the server when you're done.")
-        return 0
+        # Pass the port on the command line so the child can inherit our environment as-is
+        args = [sys.executable, server_path, "--port", str(port)]
+        if hasattr(os, "posix_spawn"):
+            pid = os.posix_spawn(sys.executable, args, os.environ)
+            # Reaps the child if it already exited, so it isn't left a zombie
+            exited = lambda: os.waitpid(pid, os.WNOHANG)[0] != 0
+        else:
+            process = subprocess.Popen(args)
+            exited = lambda: process.poll() is not None
     except Exception as e:
         print(f"Error starting server: {e}")
         return 1
+    
+    # Only report success once the server answers, so a server that fails at
+    # startup (missing Flask, port in use, ...) is reported as a failure
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while not _server_running(port):
+        if exited():
+            print("Error starting server: the server exited during startup (see its output above)")
+            return 1
+        if time.monotonic() > deadline:
+            print(f"Error starting server: no response on port {port} after {SERVER_START_TIMEOUT} seconds")
+            return 1
+        time.sleep(0.1)
+    
+    print(f"Server started! Access at http://localhost:{port}")
+    print("Use Ctrl+C to stop the server when you're done.")
+    return 0
 
-def search_archives(query: str, project: Optional[str] = None, server_url: str = DEFAULT_SERVER_URL) -> int:
-    """Search the archives"""
-    from archives_client import ArchivesClient
+def _copy_file(source: str, target: str) -> None:
+    """
+    Copy a file's contents (not its metadata) to target.
     
+    shutil.copyfile copies in the kernel with sendfile where available and
+    raises SameFileError instead of truncating the file when source and
+    target are the same.
+    """
+    import shutil
+    
+    shutil.copyfile(source, target)
+
+def _write_output(text: str) -> None:
+    """Write a block of text to stdout with a single write, in the stream's own encoding"""
+    sys.stdout.write(text + "\n")
+
+def search_archives(query: str, project: str | None = None, server_url: str = DEFAULT_SERVER_URL) -> int:
+    """Search the archives"""
     try:
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         result = client.quick_search(query, project, format_type="text")
-        print(result)
+        _write_output(result)
         return 0
     except Exception as e:
         print(f"Error searching archives: {e}")
         return 1
 
-def add_to_archives(project: str, section: str, content: str, title: Optional[str] = None,
+def add_to_archives(project: str, section: str, content: str, title: str | None = None,
                    server_url: str = DEFAULT_SERVER_URL) -> int:
     """
     Add content to archives
@@ -83,10 +198,8 @@ def add_to_archives(project: str, section: str, content: str, title: Optional[st
     Returns:
         Exit code (0 for success, 1 for error)
     """
-    from archives_client import ArchivesClient
-    
     try:
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         result = client.add(project, section, content, title)
         print(f"Successfully added to archives:")
         print(f"File: {result.get('file')}")
@@ -97,10 +210,8 @@ def add_to_archives(project: str, section: str, content: str, title: Optional[st
 
 def update_rule(name: str, content: str, server_url: str = DEFAULT_SERVER_URL) -> int:
     """Add or update a custom rule"""
-    from archives_client import ArchivesClient
-    
     try:
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         result = client.add_rule(name, content)
         print(f"Successfully updated rule '{name}':")
         print(f"File: {result.get('file')}")
@@ -111,53 +222,74 @@ def update_rule(name: str, content: str, server_url: str = DEFAULT_SERVER_URL) -
 
 def get_rules(server_url: str = DEFAULT_SERVER_URL) -> int:
     """Get all custom rules"""
-    from archives_client import ArchivesClient
-    
     try:
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         rules = client.get_rules()
         
-        print(f"Found {rules.get('count', 0)} custom rules:")
+        lines = [f"Found {rules.get('count', 0)} custom rules:"]
         for i, rule in enumerate(rules.get('rules', []), 1):
-            print(f"\n{i}. {rule.get('name', 'Unnamed Rule')}")
-            print("-" * 40)
-            print(f"Content preview: {rule.get('content', '')[:100]}...")
+            lines.append(f"\n{i}. {rule.get('name', 'Unnamed Rule')}")
+            lines.append("-" * 40)
+            lines.append(f"Content preview: {rule.get('content', '')[:100]}...")
+        _write_output("\n".join(lines))
         
         return 0
     except Exception as e:
         print(f"Error getting rules: {e}")
         return 1
 
-def generate_cursorrules(output_path: Optional[str] = None, server_url: str = DEFAULT_SERVER_URL) -> int:
-    """Generate combined cursorrules file and optionally copy to project directory"""
-    from archives_client import ArchivesClient
-    import os
+def _detect_project_dir() -> str | None:
+    """Return the current directory if it links to AI Archives via an ai.archives symlink"""
+    import stat
+    
+    current_dir = os.getcwd()
+    
+    # Check if we're running from a symlinked ai.archives directory (one lstat)
+    try:
+        st = os.lstat(os.path.join(current_dir, 'ai.archives'))
+    except OSError:
+        return None
+    return current_dir if stat.S_ISLNK(st.st_mode) else None
+
+def _confirm_copy() -> bool:
+    """Ask the user whether to copy the generated file into their project"""
+    response = input("Would you like to copy the .cursorrules file to your project? [Y/n] ").lower()
+    return response in ['', 'y', 'yes']
+
+def generate_cursorrules(output_path: str | None = None, server_url: str = DEFAULT_SERVER_URL,
+                         copy: bool | None = None) -> int:
+    """
+    Generate combined cursorrules file and optionally copy to project directory
     
+    Args:
+        output_path: Optional output file path
+        server_url: URL of the archives server
+        copy: True to copy without asking, False to never copy, None to ask
+              (only when stdin is a terminal; otherwise the file is not copied)
+        
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
     try:
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         result = client.generate_cursorrules(output_path)
         generated_file = result.get('file')
         print(f"Successfully generated cursorrules file:")
         print(f"File: {generated_file}")
         
+        if copy is False:
+            return 0
+        
         # Try to detect if we're being run from a project directory via symlink
-        current_dir = os.getcwd()
-        archives_dir = os.path.dirname(os.path.abspath(__file__))
+        project_dir = _detect_project_dir()
         
-        # Check if we're running from a symlinked ai.archives directory
-        if os.path.exists(os.path.join(current_dir, 'ai.archives')) and \
-           os.path.islink(os.path.join(current_dir, 'ai.archives')):
-            project_dir = current_dir
+        if project_dir:
             target_file = os.path.join(project_dir, '.cursorrules')
-            
-            # Ask user if they want to copy the file
             print("\nDetected project directory:", project_dir)
-            response = input("Would you like to copy the .cursorrules file to your project? [Y/n] ").lower()
             
-            if response in ['', 'y', 'yes']:
+            if copy or (sys.stdin.isatty() and _confirm_copy()):
                 try:
-                    import shutil
-                    shutil.copy2(generated_file, target_file)
+                    _copy_file(generated_file, target_file)
                     print(f"\n✅ Successfully copied .cursorrules to your project:")
                     print(f"   {target_file}")
                     print("\nAI Archives integration is now complete!")
@@ -181,15 +313,13 @@ def generate_cursorrules(output_path: Optional[str] = None, server_url: str = DE
 
 def list_projects(server_url: str = DEFAULT_SERVER_URL) -> int:
     """List all available projects"""
-    from archives_client import ArchivesClient
-    
     try:
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         result = client.list_projects()
         
-        print(f"Available projects ({result.get('count', 0)}):")
-        for project in result.get('projects', []):
-            print(f"- {project}")
+        lines = [f"Available projects ({result.get('count', 0)}):"]
+        lines.extend(f"- {project}" for project in result.get('projects', []))
+        _write_output("\n".join(lines))
         
         return 0
     except Exception as e:
@@ -198,15 +328,13 @@ def list_projects(server_url: str = DEFAULT_SERVER_URL) -> int:
 
 def list_sections(project: str, server_url: str = DEFAULT_SERVER_URL) -> int:
     """List all sections for a project"""
-    from archives_client import ArchivesClient
-    
     try:
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         result = client.list_sections(project)
         
-        print(f"Sections for project '{project}' ({result.get('count', 0)}):")
-        for section in result.get('sections', []):
-            print(f"- {section}")
+        lines = [f"Sections for project '{project}' ({result.get('count', 0)}):"]
+        lines.extend(f"- {section}" for section in result.get('sections', []))
+        _write_output("\n".join(lines))
         
         return 0
     except Exception as e:
@@ -215,13 +343,9 @@ def list_sections(project: str, server_url: str = DEFAULT_SERVER_URL) -> int:
 
 def copy_cursorrules(target_dir: str, server_url: str = DEFAULT_SERVER_URL) -> int:
     """Copy the generated cursorrules file to a target directory"""
-    from archives_client import ArchivesClient
-    import os
-    import shutil
-    
     try:
         # First ensure we have a generated cursorrules file
-        client = ArchivesClient(server_url)
+        client = _client(server_url)
         result = client.generate_cursorrules()
         source_file = result.get('file')
         
@@ -230,7 +354,7 @@ def copy_cursorrules(target_dir: str, server_url: str = DEFAULT_SERVER_URL) -> i
         target_file = os.path.join(target_dir, '.cursorrules')
         
         # Copy the file
-        shutil.copy2(source_file, target_file)
+        _copy_file(source_file, target_file)
         print(f"\n✅ Successfully copied .cursorrules to:")
         print(f"   {target_file}")
         print("\nAI Archives integration is now complete!")
@@ -239,8 +363,143 @@ def copy_cursorrules(target_dir: str, server_url: str = DEFAULT_SERVER_URL) -> i
         print(f"Error copying cursorrules: {e}")
         return 1
 
-def main() -> int:
-    """Main entry point"""
+def _batch_key(record: dict) -> tuple:
+    """
+    Get the key of the file a batch record writes to.
+    
+    Records sharing a key are sent one after another, in input order. Every
+    add to a project/section appends to that section's newest archive file
+    (or starts the next one when it is full), so grouping by section is
+    grouping by target file: concurrent adds would only queue on the same
+    file lock and land in an arbitrary order. Different sections and rules
+    run in parallel, so a --from-dir import of a single section is
+    sequential.
+    """
+    command = record.get("command")
+    args = record.get("args", {})
+    if command == "add":
+        return (command, args.get("project"), args.get("section"))
+    if command == "rule-add":
+        return (command, args.get("name"))
+    return (command,)
+
+def _run_batch_record(client, record: dict) -> dict:
+    """Send a single batch record to the server"""
+    command = record.get("command")
+    args = record.get("args", {})
+    if command == "add":
+        content = args.get("content")
+        if content is None:
+            # Records from --from-dir are read here, in the worker thread, so
+            # disk reads overlap with other workers' in-flight requests
+            with open(args["file"], 'r') as f:
+                content = f.read()
+        return client.add(args["project"], args["section"], content, args.get("title"))
+    if command == "rule-add":
+        return client.add_rule(args["name"], args["content"])
+    raise ValueError(f"Unsupported batch command: {command}")
+
+def _records_from_dir(root: str) -> list[dict]:
+    """
+    Build add records for every markdown file laid out as <root>/<project>/<section>/*.md
+    
+    Args:
+        root: Directory to import
+        
+    Returns:
+        List of batch records that reference the files by path
+    """
+    records = []
+    for project in sorted(os.listdir(root)):
+        project_dir = os.path.join(root, project)
+        if not os.path.isdir(project_dir):
+            continue
+        for section in sorted(os.listdir(project_dir)):
+            section_dir = os.path.join(project_dir, section)
+            if not os.path.isdir(section_dir):
+                continue
+            for name in sorted(os.listdir(section_dir)):
+                if name.endswith('.md'):
+                    records.append({
+                        "command": "add",
+                        "args": {"project": project, "section": section,
+                                 "file": os.path.join(section_dir, name)}
+                    })
+    return records
+
+def run_batch(path: str | None = None, server_url: str = DEFAULT_SERVER_URL,
+              from_dir: str | None = None) -> int:
+    """
+    Run add/rule-add commands from a JSONL file concurrently
+    
+    Each line is a JSON object like:
+        {"command": "add", "args": {"project": "frontend", "section": "errors", "content": "...", "title": "..."}}
+        {"command": "rule-add", "args": {"name": "my-rule", "content": "..."}}
+    
+    Records for different sections or rules run on up to BATCH_WORKERS
+    threads; records for the same one keep their order (see _batch_key).
+    
+    Args:
+        path: Path to the JSONL file
+        server_url: URL of the archives server
+        from_dir: Instead of a JSONL file, add every <project>/<section>/*.md file under this directory
+        
+    Returns:
+        Exit code (0 if every record succeeded, 1 otherwise)
+    """
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+    
+    try:
+        if from_dir:
+            records = _records_from_dir(from_dir)
+        else:
+            with open(path, 'r') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+    except Exception as e:
+        print(f"Error reading batch input: {e}")
+        return 1
+    
+    outcomes = [None] * len(records)
+    
+    # Group records by target file, keeping their original order within each group.
+    # Malformed records fail on their own instead of aborting the whole batch
+    groups = {}
+    for index, record in enumerate(records):
+        if not isinstance(record, dict) or not isinstance(record.get("args", {}), dict):
+            outcomes[index] = (False, ValueError("record must be a JSON object with an object 'args'"))
+            continue
+        groups.setdefault(_batch_key(record), []).append((index, record))
+    
+    client = _client(server_url)
+    
+    def run_group(group):
+        for index, record in group:
+            try:
+                outcomes[index] = (True, _run_batch_record(client, record))
+            except Exception as e:
+                outcomes[index] = (False, e)
+    
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+        list(executor.map(run_group, groups.values()))
+    
+    failures = 0
+    lines = []
+    for index, (ok, result) in enumerate(outcomes, 1):
+        if ok:
+            lines.append(f"{index}. OK {result.get('file')}")
+        else:
+            failures += 1
+            lines.append(f"{index}. Error: {result}")
+    lines.append(f"\nProcessed {len(records)} records ({failures} failed)")
+    print("\n".join(lines))
+    
+    return 1 if failures else 0
+
+def _build_parser():
+    """Build the argument parser for all commands"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="AI Archives Wrapper")
     
     # Add server-url as a global argument
@@ -254,11 +513,13 @@ def main() -> int:
     # Server command
     server_parser = subparsers.add_parser("server", help="Start the server")
     server_parser.add_argument("--port", type=int, default=5001, help="Port to run the server on")
+    server_parser.set_defaults(func=lambda a: start_server(a.port))
     
     # Search command
     search_parser = subparsers.add_parser("search", help="Search archives")
     search_parser.add_argument("query", help="Search query")
     search_parser.add_argument("--project", "-p", help="Project to search in")
+    search_parser.set_defaults(func=lambda a: search_archives(a.query, a.project, a.server_url))
     
     # Add command
     add_parser = subparsers.add_parser("add", help="Add to archives")
@@ -266,58 +527,69 @@ def main() -> int:
     add_parser.add_argument("section", help="Section name")
     add_parser.add_argument("content", help="Content to add")
     add_parser.add_argument("title", nargs="?", help="Entry title")
+    add_parser.set_defaults(func=lambda a: add_to_archives(a.project, a.section, a.content, a.title, a.server_url))
     
     # Rule commands
     rule_add_parser = subparsers.add_parser("rule-add", help="Add/update rule")
     rule_add_parser.add_argument("name", help="Rule name")
     rule_add_parser.add_argument("content", help="Rule content")
+    rule_add_parser.set_defaults(func=lambda a: update_rule(a.name, a.content, a.server_url))
     
     rules_parser = subparsers.add_parser("rules", help="List rules")
+    rules_parser.set_defaults(func=lambda a: get_rules(a.server_url))
     
     # Generate command
     generate_parser = subparsers.add_parser("generate", help="Generate cursorrules file")
     generate_parser.add_argument("--output", "-o", help="Output file path")
+    copy_group = generate_parser.add_mutually_exclusive_group()
+    copy_group.add_argument("--yes", "-y", dest="copy", action="store_const", const=True,
+                            help="Copy the file into the detected project without asking")
+    copy_group.add_argument("--no-copy", dest="copy", action="store_const", const=False,
+                            help="Never copy the file into the detected project")
+    generate_parser.set_defaults(func=lambda a: generate_cursorrules(a.output, a.server_url, a.copy))
     
     # Copy cursorrules command
     copy_parser = subparsers.add_parser("copy-cursorrules", help="Copy cursorrules file to target directory")
     copy_parser.add_argument("target_dir", help="Target directory to copy .cursorrules to")
+    copy_parser.set_defaults(func=lambda a: copy_cursorrules(a.target_dir, a.server_url))
     
     # List projects command
-    subparsers.add_parser("projects", help="List all projects")
+    projects_parser = subparsers.add_parser("projects", help="List all projects")
+    projects_parser.set_defaults(func=lambda a: list_projects(a.server_url))
     
     # List sections command
     sections_parser = subparsers.add_parser("sections", help="List sections for a project")
     sections_parser.add_argument("project", help="Project name")
+    sections_parser.set_defaults(func=lambda a: list_sections(a.project, a.server_url))
+    
+    # Batch command
+    batch_parser = subparsers.add_parser("batch", help="Run add/rule-add commands from a JSONL file")
+    batch_source = batch_parser.add_mutually_exclusive_group(required=True)
+    batch_source.add_argument("file", nargs="?", help="JSONL file with one {command, args} record per line")
+    batch_source.add_argument("--from-dir", help="Add every <project>/<section>/*.md file under this directory")
+    batch_parser.set_defaults(func=lambda a: run_batch(a.file, a.server_url, a.from_dir))
+    
+    return parser
+
+def main() -> int:
+    """Main entry point"""
+    # Top-level help doesn't need the full parser
+    if len(sys.argv) == 1:
+        sys.stdout.write(USAGE)
+        return 1
+    if sys.argv[1] in ("-h", "--help"):
+        sys.stdout.write(USAGE)
+        return 0
     
+    parser = _build_parser()
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         return 1
     
-    # Get server URL from args or environment variable
-    server_url = args.server_url
-    
-    if args.command == "server":
-        return start_server(args.port)
-    elif args.command == "search":
-        return search_archives(args.query, args.project, server_url)
-    elif args.command == "add":
-        return add_to_archives(args.project, args.section, args.content, args.title, server_url)
-    elif args.command == "rule-add":
-        return update_rule(args.name, args.content, server_url)
-    elif args.command == "rules":
-        return get_rules(server_url)
-    elif args.command == "generate":
-        return generate_cursorrules(args.output, server_url)
-    elif args.command == "copy-cursorrules":
-        return copy_cursorrules(args.target_dir, server_url)
-    elif args.command == "projects":
-        return list_projects(server_url)
-    elif args.command == "sections":
-        return list_sections(args.project, server_url)
-    
-    return 0
+    # Each subparser routes to its command via set_defaults(func=...)
+    return args.func(args)
 
 if __name__ == "__main__":
     sys.exit(main()) 
\ No newline at end of file
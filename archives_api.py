@@ -7,9 +7,11 @@ It handles the common operations like searching, adding to archives, etc.
 """
 
 import os
+import re
 import sys
 import json
 import logging
+import shutil
 import tempfile
 from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
@@ -20,14 +22,33 @@ sys.path.append(current_dir)
 
 # Try to import from core directly
 try:
-    from core.archives_manager import get_archives_manager
+    from core.archives_manager import get_archives_manager, _atomic_write
     from core.github_integration import get_github_integration
 except ImportError:
     # Fall back to old import path for backward compatibility
-    from archives.core.archives_manager import get_archives_manager
+    from archives.core.archives_manager import get_archives_manager, _atomic_write
     from archives.core.github_integration import get_github_integration
 
 
+# References to editing .cursorrules in the base file, and what they point to
+# instead. None of them overlaps another, so one regex pass over the base
+# content gives the same result as replacing them one after another.
+_BASE_REFERENCE_REPLACEMENTS = {
+    "the current state of `Multi-Agent Scratchpad` section in the `.cursorrules` file":
+        "the current state of the `scratchpad.md` file in the ai.archives directory",
+    "You then need to actually do the changes to the file.":
+        "You then need to actually do the changes to the `scratchpad.md` file.",
+    "also make incremental writes or modifications to the `Multi-Agent Scratchpad` section in the `.cursorrules` file":
+        "also make incremental writes or modifications to the `scratchpad.md` file",
+    "The `Multi-Agent Scratchpad` section in the `.cursorrules` file":
+        "The `scratchpad.md` file",
+    # References to the Lessons section
+    "you should take note in the `Lessons` section in the `.cursorrules` file":
+        "you should take note in the `Lessons` section of the `scratchpad.md` file in the ai.archives directory",
+}
+_BASE_REFERENCE_PATTERN = re.compile('|'.join(map(re.escape, _BASE_REFERENCE_REPLACEMENTS)))
+
+
 class ArchivesAPI:
     """
     API class for interacting with the AI Archives system.
@@ -42,7 +63,11 @@ class ArchivesAPI:
             github_token: GitHub API token. If None, tries to get from environment.
         """
         self.manager = get_archives_manager(repo_root)
-        self.github = get_github_integration(github_token)
+        # Cache the base cursorrules file between runs, like the manager does
+        self.github = get_github_integration(
+            github_token,
+            cache_path=os.path.join(self.manager.data_archives_dir, '.github_cache.json')
+        )
     
     def add_to_archives(self, project: str, section: str, content: str, title: Optional[str] = None) -> str:
         """
@@ -119,69 +144,35 @@ class ArchivesAPI:
         if not base_content:
             raise Exception("Failed to fetch base cursorrules file")
         
-        # Get custom rules - ONLY from custom-rules.md
-        custom_rules_path = os.path.join(self.manager.repo_root, 'custom-rules.md')
-        if os.path.exists(custom_rules_path):
-            with open(custom_rules_path, 'r') as f:
-                custom_rules_content = f.read()
-        else:
-            custom_rules_content = ""
-        
-        # Start with the custom rules section
-        merged_content = "# AI Archives - Custom Rules\n\n"
-        
-        # Add custom rules content directly
-        merged_content += custom_rules_content + "\n\n"
-        
-        # Add a note about the scratchpad.md file
-        merged_content += "# IMPORTANT: AI Scratchpad Location\n\n"
-        merged_content += "When working with this project, all planning, progress tracking, and lessons learned should be written to:\n\n"
-        merged_content += "```\n./ai.archives/scratchpad.md\n```\n\n"
-        merged_content += "DO NOT modify this .cursorrules file directly. Instead, use the scratchpad.md file for all dynamic content.\n\n"
-        
-        # Add separator between custom rules and base content
-        merged_content += "# Base CursorRules\n\n"
-        
-        # Modify base content to use separate files instead of editing .cursorrules
-        modified_base_content = base_content
-        
-        # Replace references to editing .cursorrules with scratchpad.md
-        modified_base_content = modified_base_content.replace(
-            "the current state of `Multi-Agent Scratchpad` section in the `.cursorrules` file", 
-            "the current state of the `scratchpad.md` file in the ai.archives directory"
-        )
-        
-        modified_base_content = modified_base_content.replace(
-            "You then need to actually do the changes to the file.", 
-            "You then need to actually do the changes to the `scratchpad.md` file."
-        )
-        
-        modified_base_content = modified_base_content.replace(
-            "also make incremental writes or modifications to the `Multi-Agent Scratchpad` section in the `.cursorrules` file", 
-            "also make incremental writes or modifications to the `scratchpad.md` file"
-        )
-        
-        modified_base_content = modified_base_content.replace(
-            "The `Multi-Agent Scratchpad` section in the `.cursorrules` file", 
-            "The `scratchpad.md` file"
-        )
-        
-        # Replace references to the Lessons section
-        modified_base_content = modified_base_content.replace(
-            "you should take note in the `Lessons` section in the `.cursorrules` file", 
-            "you should take note in the `Lessons` section of the `scratchpad.md` file in the ai.archives directory"
-        )
-        
-        # Add base content with modifications
-        merged_content += modified_base_content
-        
         # Set default output path if not provided
         if output_path is None:
             output_path = os.path.join(self.manager.repo_root, '.cursorrules')
         
-        # Write combined file
-        with open(output_path, 'w') as f:
-            f.write(merged_content)
+        # Write combined file (atomically, so readers never see a partial
+        # file), streaming each part instead of concatenating them first
+        with _atomic_write(output_path) as f:
+            # Start with the custom rules section
+            f.write("# AI Archives - Custom Rules\n\n")
+            
+            # Add custom rules - ONLY from custom-rules.md
+            custom_rules_path = os.path.join(self.manager.repo_root, 'custom-rules.md')
+            if os.path.exists(custom_rules_path):
+                with open(custom_rules_path, 'r') as rules:
+                    shutil.copyfileobj(rules, f)
+            f.write("\n\n")
+            
+            # Add a note about the scratchpad.md file
+            f.write("# IMPORTANT: AI Scratchpad Location\n\n")
+            f.write("When working with this project, all planning, progress tracking, and lessons learned should be written to:\n\n")
+            f.write("```\n./ai.archives/scratchpad.md\n```\n\n")
+            f.write("DO NOT modify this .cursorrules file directly. Instead, use the scratchpad.md file for all dynamic content.\n\n")
+            
+            # Add separator between custom rules and base content
+            f.write("# Base CursorRules\n\n")
+            
+            # Add base content, pointing references to editing .cursorrules
+            # at scratchpad.md instead (all replacements in one pass)
+            f.write(_BASE_REFERENCE_PATTERN.sub(lambda m: _BASE_REFERENCE_REPLACEMENTS[m.group()], base_content))
         
         # Create a combined scratchpad.md file if it doesn't exist
         scratchpad_path = os.path.join(self.manager.repo_root, 'scratchpad.md')
@@ -236,12 +227,9 @@ class ArchivesAPI:
         
         target_file = os.path.join(target_project_path, '.cursorrules')
         
-        # Copy file
-        with open(combined_path, 'r') as f:
-            content = f.read()
-        
-        with open(target_file, 'w') as f:
-            f.write(content)
+        # Copy file, replacing the target atomically
+        with open(combined_path, 'r') as src, _atomic_write(target_file) as dst:
+            shutil.copyfileobj(src, dst)
         
         return target_file
 
@@ -9,8 +9,16 @@ This eliminates the need for complex Python environment setup and command-line c
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Any, Optional, Union
 
+# Use orjson for decoding responses when it's installed (optional dependency)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 class ArchivesClient:
     """Client for the AI Archives REST API"""
     
@@ -22,12 +30,19 @@ class ArchivesClient:
             base_url: Base URL of the Archives REST API
         """
         self.base_url = base_url.rstrip('/')
+        
+        # Reuse one keep-alive connection across calls instead of opening a new
+        # socket for every request
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
     
     def ping(self) -> Dict[str, Any]:
         """Check if the server is running"""
-        response = requests.get(f"{self.base_url}/ping")
+        response = self._session.get(f"{self.base_url}/ping")
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def search(self, query: str, project: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -44,9 +59,9 @@ class ArchivesClient:
         if project:
             params['project'] = project
             
-        response = requests.get(f"{self.base_url}/search", params=params)
+        response = self._session.get(f"{self.base_url}/search", params=params)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def quick_search(self, query: str, project: Optional[str] = None, format_type: str = "json") -> Union[Dict[str, Any], str]:
         """
@@ -64,13 +79,13 @@ class ArchivesClient:
         if project:
             params['project'] = project
             
-        response = requests.get(f"{self.base_url}/quick-search", params=params)
+        response = self._session.get(f"{self.base_url}/quick-search", params=params)
         response.raise_for_status()
         
         if format_type == 'text':
             return response.text
         else:
-            return response.json()
+            return _loads(response.content)
     
     def add(self, project: str, section: str, content: str, title: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -101,9 +116,9 @@ class ArchivesClient:
         if title:
             data['title'] = title
             
-        response = requests.post(f"{self.base_url}/add", json=data)
+        response = self._session.post(f"{self.base_url}/add", json=data)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def get_rules(self) -> Dict[str, Any]:
         """
@@ -112,9 +127,9 @@ class ArchivesClient:
         Returns:
             Rules as a dictionary
         """
-        response = requests.get(f"{self.base_url}/rules")
+        response = self._session.get(f"{self.base_url}/rules")
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def add_rule(self, name: str, content: str) -> Dict[str, Any]:
         """
@@ -128,9 +143,9 @@ class ArchivesClient:
             Result as a dictionary
         """
         data = {'name': name, 'content': content}
-        response = requests.post(f"{self.base_url}/rules", json=data)
+        response = self._session.post(f"{self.base_url}/rules", json=data)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def generate_cursorrules(self, output_path: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -146,9 +161,9 @@ class ArchivesClient:
         if output_path:
             data['output_path'] = output_path
             
-        response = requests.post(f"{self.base_url}/generate-cursorrules", json=data)
+        response = self._session.post(f"{self.base_url}/generate-cursorrules", json=data)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def list_projects(self) -> Dict[str, Any]:
         """
@@ -157,9 +172,9 @@ class ArchivesClient:
         Returns:
             Projects as a dictionary
         """
-        response = requests.get(f"{self.base_url}/list-projects")
+        response = self._session.get(f"{self.base_url}/list-projects")
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     
     def list_sections(self, project: str) -> Dict[str, Any]:
         """
@@ -172,9 +187,9 @@ class ArchivesClient:
             Sections as a dictionary
         """
         params = {'project': project}
-        response = requests.get(f"{self.base_url}/list-sections", params=params)
+        response = self._session.get(f"{self.base_url}/list-sections", params=params)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
 
 
 # Simple usage example
@@ -8,23 +8,147 @@ custom rules and integrating with the base cursorrules file.
 """
 
 import os
+import io
 import json
 import re
-import glob
-from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-import tempfile
-import shutil
+import mmap
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import time
+from typing import List, Dict, Any, Optional, Tuple, Callable, TypeVar
+
+# Use orjson for parsing JSON files when it's installed (optional dependency)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Advisory file locks for appends (not available on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+T = TypeVar('T')
 
 # Regular expression to match ANSI color codes
-ANSI_COLOR_PATTERN = re.compile(r'\x1B\[\d+(;\d+)*(;*[mK])')
+ANSI_COLOR_PATTERN = re.compile(r'\x1B\[\d+(?:;\d+)*;*[mK]')
 # Improved regex for error messages
-ERROR_MESSAGE_PATTERN = re.compile(r'(\[31m|\[1m|\[22m|\[39m|Usage Error[^\n]*)')
+ERROR_MESSAGE_PATTERN = re.compile(r'\[(?:31|1|22|39)m|Usage Error[^\n]*')
 # Regex to fix yarn commands
 YARN_COMMAND_PATTERN = re.compile(r'\$ +yarn +run +\[.*?\] +your-script')
+# Regexes for the markdown fixes in sanitize_content
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+HEADER_SPACING_PATTERN = re.compile(r'(#+)([^#\s])')
+LIST_SPACING_PATTERN = re.compile(r'(\n\s*[-*])([^\s])')
+CODE_BLOCK_OPEN_PATTERN = re.compile(r'([^\n])```')
+CODE_BLOCK_CLOSE_PATTERN = re.compile(r'```([^\n])')
 # Regex for tokenization (alphanumeric and underscores)
 TOKEN_PATTERN = re.compile(r'\w+')
+# Regex for runs of ASCII characters (used to pre-filter files on raw bytes)
+ASCII_RUN_PATTERN = re.compile(r'[\x00-\x7f]+')
+
+# Directory of this module and the repo root (where the project was installed).
+# Resolved once at import time since neither changes while the process runs
+_CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.dirname(_CORE_DIR)
+
+# Searches over at least this many files are spread over SEARCH_WORKERS threads.
+# The work is mostly waiting on file reads, so use more threads than CPUs
+PARALLEL_SEARCH_MIN_FILES = 32
+SEARCH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Total characters of decoded archive files kept in memory between searches
+SEARCH_CACHE_CHARS = 64 * 1024 * 1024
+
+# Settings used when core/config.json is missing
+DEFAULT_CONFIG = {
+    "max_file_lines": 500,
+    "default_format": "markdown",
+    "search_max_bytes": 2 * 1024 * 1024,
+    "archive_structure": {
+        "projects": ["frontend", "backend", "shared"],
+        "sections": ["setup", "architecture", "errors", "fixes", "apis", "dependencies", "recommendations"]
+    },
+    "cursorrules": {
+        "base_repo": "grapeot/devin.cursorrules",
+        "base_branch": "multi-agent",
+        "base_file": ".cursorrules",
+        "custom_rules_dir": ""
+    }
+}
+
+# Parsed config files keyed by path, stored as (st_mtime_ns, config)
+_CONFIG_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+def _load_config(config_path: str) -> Dict[str, Any]:
+    """
+    Load a JSON config file, reusing the parsed result while the file is unchanged.
+    
+    Args:
+        config_path: Path to the config file
+        
+    Returns:
+        The parsed config (shared between callers, treat as read-only), or the
+        default config if the file doesn't exist
+    """
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except FileNotFoundError:
+        return {'settings': DEFAULT_CONFIG}
+    
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    
+    with open(config_path, 'rb') as f:
+        config = _loads(f.read())
+    
+    _CONFIG_CACHE[config_path] = (mtime_ns, config)
+    return config
+
+def _scan_entries(dirpath: str, suffix: str = '', dirs: bool = False):
+    """
+    Iterate over the entries of a directory in a single scandir pass.
+    
+    Equivalent to glob.glob(os.path.join(dirpath, '*' + suffix)) filtered to
+    files (or directories), but uses the type information scandir already has
+    instead of stat'ing every entry. Hidden entries are skipped like glob does.
+    
+    Args:
+        dirpath: Directory to list
+        suffix: Only include names ending with this suffix
+        dirs: List directories instead of files
+        
+    Yields:
+        os.DirEntry objects, in directory order (none if the directory doesn't exist)
+    """
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if not entry.name.startswith('.') \
+                   and entry.name.endswith(suffix) \
+                   and (entry.is_dir() if dirs else entry.is_file()):
+                    yield entry
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+def _list_entries(dirpath: str, suffix: str = '', dirs: bool = False) -> List[str]:
+    """
+    List the paths of the entries of a directory (see _scan_entries).
+    
+    Args:
+        dirpath: Directory to list
+        suffix: Only include names ending with this suffix
+        dirs: List directories instead of files
+        
+    Returns:
+        List of paths, in directory order (empty if the directory doesn't exist)
+    """
+    return [entry.path for entry in _scan_entries(dirpath, suffix, dirs)]
 
 def tokenize(text: str) -> List[str]:
     """
@@ -38,6 +162,22 @@ def tokenize(text: str) -> List[str]:
     """
     return [token.lower() for token in TOKEN_PATTERN.findall(text)]
 
+@functools.lru_cache(maxsize=256)
+def _token_pattern(token: str) -> "re.Pattern[str]":
+    """
+    Compile the pattern for a token that is not followed by a letter or digit.
+    
+    The token is matched as a literal prefix, so the regex engine can skip
+    ahead with a fast substring search ([^\\W_] is str.isalnum in re).
+    
+    Args:
+        token: Lowercase search token
+        
+    Returns:
+        Compiled pattern
+    """
+    return re.compile(re.escape(token) + r'(?![^\W_])')
+
 def score_document(query_tokens: List[str], content: str) -> Tuple[int, List[int]]:
     """
     Score a document based on token matches.
@@ -49,31 +189,292 @@ def score_document(query_tokens: List[str], content: str) -> Tuple[int, List[int
     Returns:
         Tuple of (score, list of match positions)
     """
-    content_lower = content.lower()
-    score = 0
+    return _score_lowercase(query_tokens, content.lower())
+
+def _score_lowercase(query_tokens: List[str], content_lower: str) -> Tuple[int, List[int]]:
+    """
+    Score a document that was already lowercased (see score_document).
+    
+    Args:
+        query_tokens: List of tokens from the search query
+        content_lower: Lowercased document content
+        
+    Returns:
+        Tuple of (score, list of match positions)
+    """
     positions = []
     
     for token in query_tokens:
-        # Check for exact token matches
-        idx = 0
-        while idx < len(content_lower):
-            idx = content_lower.find(token, idx)
-            if idx == -1:
-                break
-                
-            # Verify it's a complete word (not part of another word)
-            # Check before the token
-            before_ok = idx == 0 or not content_lower[idx-1].isalnum()
-            # Check after the token
-            after_ok = idx + len(token) >= len(content_lower) or not content_lower[idx + len(token)].isalnum()
-            
-            if before_ok and after_ok:
-                score += 1
+        # The pattern checks the character after the token; only the one
+        # before it is left to check here (not part of another word)
+        search = _token_pattern(token).search
+        match = search(content_lower)
+        while match:
+            idx = match.start()
+            if idx == 0 or not content_lower[idx-1].isalnum():
                 positions.append(idx)
-                
-            idx += 1
+            
+            # Restart one character later so overlapping matches are found
+            match = search(content_lower, idx + 1)
+    
+    return len(positions), positions
+
+# Custom rule contents keyed by path, stored as ((st_mtime_ns, st_size), content)
+_RULE_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+def _read_rule(rule_file: str) -> str:
+    """
+    Read a custom rule file, reusing the content while the file is unchanged.
+    
+    Args:
+        rule_file: Path to the rule file
+        
+    Returns:
+        The content of the rule file
+    """
+    with open(rule_file, 'r') as f:
+        st = os.fstat(f.fileno())
+        key = (st.st_mtime_ns, st.st_size)
+        
+        cached = _RULE_CACHE.get(rule_file)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        content = f.read()
+    
+    _RULE_CACHE[rule_file] = (key, content)
+    return content
+
+def _read_rule_if_exists(rule_file: str) -> Optional[str]:
+    """
+    Read a custom rule file through the rule cache, if it exists.
+    
+    Args:
+        rule_file: Path to the rule file
+        
+    Returns:
+        The content of the rule file, or None if it doesn't exist
+    """
+    try:
+        return _read_rule(rule_file)
+    except FileNotFoundError:
+        return None
+
+def _literal_pattern(strings: List[str]) -> Optional["re.Pattern[bytes]"]:
+    """
+    Build a bytes pattern that every file containing one of the strings matches.
+    
+    Each string contributes its longest ASCII run, matched case-insensitively,
+    so the pattern also works as a pre-filter for queries with non-ASCII
+    characters (which bytes patterns can't case-fold). The result is an
+    alternation of the runs, scanned in one pass.
+    
+    Args:
+        strings: Strings a file has to contain (any one of them, ignoring case)
+        
+    Returns:
+        Compiled pattern, or None if some string has no ASCII characters to
+        filter on
+    """
+    literals = []
+    for string in strings:
+        runs = ASCII_RUN_PATTERN.findall(string)
+        if not runs:
+            return None
+        literals.append(max(runs, key=len).encode('ascii'))
+    
+    if not literals:
+        return None
+    
+    return re.compile(b'|'.join(re.escape(literal) for literal in literals), re.IGNORECASE)
+
+# Decoded archive files keyed by path, stored as ((st_mtime_ns, st_size), content)
+# in least recently used order. Guarded by _SEARCH_CACHE_LOCK since searches
+# read files from several threads
+_SEARCH_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], str]]" = OrderedDict()
+_SEARCH_CACHE_LOCK = threading.Lock()
+_search_cache_chars = 0
+
+def _cache_searchable(file_path: str, key: Tuple[int, int], content: str) -> None:
+    """
+    Remember the decoded content of an archive file for later searches.
+    
+    Least recently used files are dropped once the cache holds more than
+    SEARCH_CACHE_CHARS characters.
+    
+    Args:
+        file_path: Path to the file
+        key: (st_mtime_ns, st_size) of the file when it was read
+        content: Decoded file content
+    """
+    global _search_cache_chars
+    
+    if len(content) > SEARCH_CACHE_CHARS:
+        return
+    
+    with _SEARCH_CACHE_LOCK:
+        old = _SEARCH_CACHE.pop(file_path, None)
+        if old:
+            _search_cache_chars -= len(old[1])
+        
+        _SEARCH_CACHE[file_path] = (key, content)
+        _search_cache_chars += len(content)
+        
+        while _search_cache_chars > SEARCH_CACHE_CHARS:
+            _, (_, evicted) = _SEARCH_CACHE.popitem(last=False)
+            _search_cache_chars -= len(evicted)
+
+def _read_searchable(file_path: str, max_bytes: int,
+                     pattern: Optional["re.Pattern[bytes]"] = None) -> Optional[str]:
+    """
+    Read an archive file for searching, skipping files that can't match.
+    
+    Files larger than max_bytes and files that look binary (a NUL byte in
+    the first 4 KiB) are skipped. If a compiled bytes pattern is given, the
+    file is memory-mapped and only decoded when the pattern occurs in its raw
+    bytes, so non-matching files are never copied into Python memory.
+    Everything happens on one open file. Decoded files are kept in
+    _SEARCH_CACHE until they change, so repeated searches (e.g. from the
+    API server) don't decode them again.
+    
+    Args:
+        file_path: Path to the file
+        max_bytes: Largest file size to search
+        pattern: Optional compiled bytes pattern the file must contain
+        
+    Returns:
+        The file content (decoded like open(file_path, 'r')), or None if the
+        file was skipped
+    """
+    with open(file_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        if size > max_bytes or b'\x00' in f.peek(4096)[:4096]:
+            return None
+        
+        if pattern is not None:
+            if size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if pattern.search(mm) is None:
+                    return None
+        
+        key = (st.st_mtime_ns, size)
+        with _SEARCH_CACHE_LOCK:
+            cached = _SEARCH_CACHE.get(file_path)
+            if cached and cached[0] == key:
+                _SEARCH_CACHE.move_to_end(file_path)
+                return cached[1]
+        
+        f.seek(0)
+        with io.TextIOWrapper(f) as text:
+            content = text.read()
     
-    return score, positions
+    _cache_searchable(file_path, key, content)
+    return content
+
+def _extract_title(content: str, file_path: str) -> str:
+    """
+    Get the title of an archive file from its first line or its filename.
+    
+    Only the first line is sliced out; splitting would copy the rest of the
+    content into a second string.
+    
+    Args:
+        content: File content
+        file_path: Path to the file
+        
+    Returns:
+        The heading text of the first line, or the file name
+    """
+    end = content.find('\n')
+    first_line = content if end == -1 else content[:end]
+    return first_line.lstrip('#').strip() if first_line.startswith('#') else os.path.basename(file_path)
+
+@contextmanager
+def _atomic_write(path: str):
+    """
+    Open a temporary file for writing that replaces `path` when closed.
+    
+    Readers see either the old or the complete new file, never a partial
+    one, and the new content is fsync'ed before it replaces the old file.
+    The temporary file is created next to `path` (hidden, so archive
+    listings skip it) and is removed if writing fails.
+    
+    Args:
+        path: File to write
+        
+    Yields:
+        Text file object to write the new content to
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    
+    # Create the temporary file like open() would (0666 minus the umask), so
+    # a new file ends up with the default mode without reading the umask
+    while True:
+        tmp_path = os.path.join(directory, f".{name}.{os.urandom(6).hex()}.tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            break
+        except FileExistsError:
+            continue
+    
+    try:
+        with os.fdopen(fd, 'w') as f:
+            yield f
+            
+            # Make sure the data is on disk before the rename can be, so a
+            # crash can't leave an empty file in place of the old one
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # Keep the mode of the file being replaced
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _map_files(func: Callable[[str, str, str], T], archive_files: List[Tuple[str, str, str]]) -> List[T]:
+    """
+    Apply a function to every (project, section, file_path) tuple.
+    
+    Large file sets are spread over a thread pool so file reads overlap.
+    Results keep the order of `archive_files`, so callers see the same
+    order as a serial loop.
+    
+    Args:
+        func: Function taking (project, section, file_path)
+        archive_files: Files to process
+        
+    Returns:
+        List of results, one per file
+    """
+    if len(archive_files) < PARALLEL_SEARCH_MIN_FILES or SEARCH_WORKERS < 2:
+        return [func(*entry) for entry in archive_files]
+    
+    return list(_search_executor().map(func, *zip(*archive_files)))
+
+@functools.lru_cache(maxsize=1)
+def _search_executor() -> "ThreadPoolExecutor":
+    """
+    Get the thread pool shared by all searches.
+    
+    Created on first use and kept for the life of the process, so searches
+    don't pay for starting and joining threads each time.
+    
+    Returns:
+        ThreadPoolExecutor with SEARCH_WORKERS threads
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    return ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix='archives-search')
 
 def sanitize_content(content):
     """
@@ -103,32 +504,44 @@ def sanitize_content(content):
         # If evaluation fails, keep the original content
         pass
     
+    # Each pass is skipped when the text it targets can't be present, so
+    # clean content (the common case) is only scanned by the `in` checks.
+    # The passes still run in order since earlier ones can expose matches
+    # for later ones (e.g. blank lines left behind by removed messages)
+    sanitized = content
+    
     # Remove ANSI color codes
-    sanitized = ANSI_COLOR_PATTERN.sub('', content)
+    if '\x1b' in sanitized:
+        sanitized = ANSI_COLOR_PATTERN.sub('', sanitized)
     
     # Remove error messages
-    sanitized = ERROR_MESSAGE_PATTERN.sub('', sanitized)
+    if '[' in sanitized or 'Usage Error' in sanitized:
+        sanitized = ERROR_MESSAGE_PATTERN.sub('', sanitized)
     
     # Fix yarn commands
-    sanitized = YARN_COMMAND_PATTERN.sub('`yarn ios`', sanitized)
-    sanitized = sanitized.replace('`yarn ios` ... to build and run on Android simulator or device', '`yarn android` to build and run on Android simulator or device')
+    if 'yarn' in sanitized:
+        sanitized = YARN_COMMAND_PATTERN.sub('`yarn ios`', sanitized)
+        sanitized = sanitized.replace('`yarn ios` ... to build and run on Android simulator or device', '`yarn android` to build and run on Android simulator or device')
     
     # Fix common issues with code command examples
     sanitized = sanitized.replace("<scriptName> ...", "your-script ...")
     
     # Fix multiple consecutive newlines that might appear after removing content
-    sanitized = re.sub(r'\n{3,}', '\n\n', sanitized)
+    if '\n\n\n' in sanitized:
+        sanitized = BLANK_LINES_PATTERN.sub('\n\n', sanitized)
     
     # Fix markdown formatting issues
     # Ensure proper spacing after headers
-    sanitized = re.sub(r'(#+)([^#\s])', r'\1 \2', sanitized)
+    if '#' in sanitized:
+        sanitized = HEADER_SPACING_PATTERN.sub(r'\1 \2', sanitized)
     
     # Fix lists without spaces after bullet points
-    sanitized = re.sub(r'(\n\s*[-*])([^\s])', r'\1 \2', sanitized)
+    sanitized = LIST_SPACING_PATTERN.sub(r'\1 \2', sanitized)
     
     # Ensure code blocks have newlines before and after them
-    sanitized = re.sub(r'([^\n])```', r'\1\n```', sanitized)
-    sanitized = re.sub(r'```([^\n])', r'```\n\1', sanitized)
+    if '```' in sanitized:
+        sanitized = CODE_BLOCK_OPEN_PATTERN.sub(r'\1\n```', sanitized)
+        sanitized = CODE_BLOCK_CLOSE_PATTERN.sub(r'```\n\1', sanitized)
     
     # Remove duplicate headers (sometimes an AI might repeat the title)
     lines = sanitized.split('\n')
@@ -142,6 +555,11 @@ class ArchivesManager:
     Main class for managing the AI Archives system.
     """
     
+    __slots__ = (
+        'repo_root', 'config_path', 'token', 'data_path',
+        'archives_dir', 'api_dir', 'data_archives_dir', '_search_index'
+    )
+    
     def __init__(self, data_path=None, github_token=None):
         """
         Initialize the ArchivesManager with the given data path.
@@ -151,15 +569,10 @@ class ArchivesManager:
             github_token: GitHub API token for integration features
         """
         # Get the repo root (where the project was installed)
-        self.repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.repo_root = _REPO_ROOT
         
-        # Load config if it exists
-        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                self.config = json.load(f)
-        else:
-            self.config = {'settings': DEFAULT_CONFIG}
+        # Config is loaded on use (see the config property)
+        self.config_path = os.path.join(_CORE_DIR, 'config.json')
         
         self.token = github_token or os.environ.get('GITHUB_TOKEN')
         
@@ -187,6 +600,27 @@ class ArchivesManager:
         # Create directories if they don't exist
         self._ensure_directories_exist()
         
+        # Full-text index used to narrow down search candidates, created on first use
+        self._search_index = None
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """
+        The parsed config.json (or the default config).
+        
+        Read through _load_config on every access, which costs one stat while
+        the file is unchanged, so edits are picked up by long-lived managers.
+        """
+        return _load_config(self.config_path)
+    
+    @property
+    def search_index(self):
+        """The SearchIndex of the data archives, created on first use."""
+        if self._search_index is None:
+            from .search_index import SearchIndex
+            self._search_index = SearchIndex(os.path.join(self.data_archives_dir, '.search_index.db'))
+        return self._search_index
+        
     def _ensure_directories_exist(self):
         """Create required directories if they don't exist."""
         os.makedirs(self.data_path, exist_ok=True)
@@ -216,28 +650,36 @@ class ArchivesManager:
             print(f"Warning: Section '{section}' is not in the configured sections list: {valid_sections}")
             print(f"Creating directory for new section: {section}")
         
-        # Create directories if they don't exist
         project_dir = os.path.join(self.data_archives_dir, project)
-        os.makedirs(project_dir, exist_ok=True)
-        
         section_dir = os.path.join(project_dir, section)
-        os.makedirs(section_dir, exist_ok=True)
         
-        # Try to find an existing file with content
-        existing_files = glob.glob(os.path.join(section_dir, "*.md"))
+        # Try to find an existing file with content, using the most recently
+        # modified one. Finding one also proves the directories exist, so they
+        # are only created when it's missing
+        latest_file = max(_scan_entries(section_dir, '.md'),
+                          key=lambda entry: entry.stat().st_mtime, default=None)
         
-        if existing_files:
-            # Use the most recently modified file
-            existing_files.sort(key=lambda f: os.path.getmtime(f), reverse=True)
-            return existing_files[0], False
+        if latest_file is not None:
+            return latest_file.path, False
         
-        # Create a new file if none exists
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        new_file = os.path.join(section_dir, f"{project}_{section}_{timestamp}.md")
+        # Create directories if they don't exist (this creates project_dir too)
+        os.makedirs(section_dir, exist_ok=True)
         
-        # Create the file
-        with open(new_file, 'w') as f:
-            f.write("")
+        # Create a new file if none exists
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        base_name = os.path.join(section_dir, f"{project}_{section}_{timestamp}")
+        new_file = f"{base_name}.md"
+        
+        # Create the file with O_EXCL so a writer that started the section in
+        # the same second gets its own file instead of truncating this one
+        suffix = 0
+        while True:
+            try:
+                os.close(os.open(new_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+                break
+            except FileExistsError:
+                suffix += 1
+                new_file = f"{base_name}_{suffix}.md"
         
         return new_file, True
     
@@ -259,35 +701,100 @@ class ArchivesManager:
         Returns:
             Path to the updated archive file
         """
-        # Get the appropriate archive file
-        archive_file, is_new_file = self.get_appropriate_archive_file(project, section)
+        with self.bulk_append(project, section) as append:
+            return append(content, title)
+    
+    def _format_entry(self, project: str, section: str, content: str,
+                      title: Optional[str], is_new_file: bool) -> str:
+        """
+        Format content as the text to append to an archive file.
         
+        Args:
+            project: Project name
+            section: Section name
+            content: Content to add
+            title: Optional title for the content
+            is_new_file: Whether the entry starts a new (empty) archive file
+            
+        Returns:
+            Text to append to the archive file
+        """
         # Sanitize content
         sanitized_content = sanitize_content(content)
         
-        # Format the content
         if is_new_file:
-            if title:
-                formatted_content = f"# {title}\n\n{sanitized_content}"
-            else:
+            if not title:
                 title = f"{project.capitalize()} {section.capitalize()}"
-                formatted_content = f"# {title}\n\n{sanitized_content}"
-        else:
-            # Read existing content
-            with open(archive_file, 'r') as f:
-                existing_content = f.read()
+            return f"# {title}\n\n{sanitized_content}"
+        
+        # Add new content with a divider
+        if title:
+            return f"\n\n---\n\n## {title}\n\n{sanitized_content}"
+        return f"\n\n---\n\n{sanitized_content}"
+    
+    @contextmanager
+    def bulk_append(self, project: str, section: str):
+        """
+        Add several entries to the same archive file with a single open().
+        
+        Yields a function taking (content, title=None) that appends one entry
+        and returns the path of the archive file. The first entry in a new
+        file gets the file header, later ones are separated by dividers, so
+        the result is the same as calling add_to_archives for each entry.
+        
+        The search index isn't updated here; the next search re-indexes the
+        file since its size and mtime changed.
+        
+        Args:
+            project: Project name (e.g., 'frontend', 'backend', 'shared')
+            section: Section name (e.g., 'setup', 'errors', 'fixes')
+        """
+        # Get the appropriate archive file
+        archive_file, _ = self.get_appropriate_archive_file(project, section)
+        
+        # New files were already created (empty) by get_appropriate_archive_file,
+        # so both cases append in place. Other writers can see a new file as
+        # soon as it exists, so it's locked like any other; the lock is
+        # released when the file is closed
+        with open(archive_file, 'a', buffering=1 << 16) as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
             
-            # Add new content with a divider
-            if title:
-                formatted_content = f"{existing_content}\n\n---\n\n## {title}\n\n{sanitized_content}"
-            else:
-                formatted_content = f"{existing_content}\n\n---\n\n{sanitized_content}"
+            # Decide on the file header under the lock: another writer may
+            # have filled a file we just created, or we may have picked up a
+            # file another writer created but hasn't written to yet
+            is_new_file = os.fstat(f.fileno()).st_size == 0
+            
+            def append(content: str, title: Optional[str] = None) -> str:
+                nonlocal is_new_file
+                f.write(self._format_entry(project, section, content, title, is_new_file))
+                is_new_file = False
+                return archive_file
+            
+            yield append
+    
+    def _list_archive_files(self, projects: List[str]) -> List[Tuple[str, str, str]]:
+        """
+        List the archive files of the given projects.
         
-        # Write to the file
-        with open(archive_file, 'w') as f:
-            f.write(formatted_content)
+        Args:
+            projects: Projects to list
+            
+        Returns:
+            List of (project, section, file_path) tuples
+        """
+        archive_files = []
         
-        return archive_file
+        for proj in projects:
+            project_dir = os.path.join(self.data_archives_dir, proj)
+            
+            for section_dir in _list_entries(project_dir, dirs=True):
+                section = os.path.basename(section_dir)
+                
+                for file_path in _list_entries(section_dir, '.md'):
+                    archive_files.append((proj, section, file_path))
+        
+        return archive_files
     
     def search_archives(self, query: str, project: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -300,14 +807,80 @@ class ArchivesManager:
         Returns:
             List of matching entries
         """
-        results = []
+        # Both stages work on the same listing of the archive files
+        archive_files = self._list_archive_files(self._search_projects(project))
         
         # First check if the exact query string matches (for backward compatibility)
-        exact_results = self._exact_match_search(query, project)
+        exact_results = self._exact_match_search_many([query], project, archive_files)[query]
         if exact_results:
             return exact_results
         
         # If no exact matches, try tokenized search
+        return self._tokenized_search(query, project, archive_files)
+    
+    def search_many(self, queries: List[str], project: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search the archives for several queries at once.
+        
+        The exact match stage reads each archive file once for all queries
+        instead of once per query. Results are the same as calling
+        search_archives for each query.
+        
+        Args:
+            queries: Search queries
+            project: Optional project to limit the search to
+            
+        Returns:
+            Dictionary mapping each query to its list of matching entries
+        """
+        projects = self._search_projects(project)
+        archive_files = self._list_archive_files(projects)
+        exact_results = self._exact_match_search_many(queries, project, archive_files)
+        
+        # The search index only needs to be brought up to date once for all
+        # queries that fall back to tokenized search
+        index_ready = None
+        results = {}
+        for query, exact in exact_results.items():
+            if not exact and index_ready is None:
+                index_ready = self.search_index.refresh(archive_files, projects, self._search_max_bytes())
+            results[query] = exact or self._tokenized_search(query, project, archive_files, index_ready)
+        
+        return results
+    
+    def _search_max_bytes(self) -> int:
+        """Largest archive file a search reads (and the search index stores)."""
+        return self.config["settings"].get("search_max_bytes", DEFAULT_CONFIG["search_max_bytes"])
+    
+    def _search_projects(self, project: Optional[str] = None) -> List[str]:
+        """
+        Get the projects a search covers.
+        
+        Args:
+            project: Optional project to limit the search to
+            
+        Returns:
+            List of project names
+        """
+        if project:
+            return [project]
+        return self.config["settings"]["archive_structure"]["projects"]
+    
+    def _tokenized_search(self, query: str, project: Optional[str] = None,
+                          archive_files: Optional[List[Tuple[str, str, str]]] = None,
+                          index_ready: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Search the archives for the tokens of a query, ranked by score.
+        
+        Args:
+            query: Search query
+            project: Optional project to limit the search to
+            archive_files: Archive files to search, if the caller already listed them
+            index_ready: Result of a search index refresh the caller already did
+            
+        Returns:
+            List of matching entries
+        """
         query_tokens = tokenize(query)
         
         # Skip tokenized search if there are no valid tokens
@@ -315,57 +888,76 @@ class ArchivesManager:
             return []
             
         # Determine which projects to search
-        if project:
-            projects = [project]
-        else:
-            projects = self.config["settings"]["archive_structure"]["projects"]
-        
-        # Search each project
-        for proj in projects:
-            project_dir = os.path.join(self.data_archives_dir, proj)
+        projects = self._search_projects(project)
+        
+        # Skip oversized files (e.g. logs copied into the archives)
+        max_bytes = self._search_max_bytes()
+        
+        if archive_files is None:
+            archive_files = self._list_archive_files(projects)
+        
+        # Use the full-text index to skip files that contain none of the tokens.
+        # Only ASCII tokens with a letter or digit are looked up, since those
+        # always leave at least one word for the index to match (a token like
+        # '__' has none, and unicode61 may not keep every non-ASCII character
+        # that str.isalnum accepts)
+        candidates = None
+        if all(token.isascii() and any(c.isalnum() for c in token) for token in query_tokens):
+            if index_ready is None:
+                index_ready = self.search_index.refresh(archive_files, projects, max_bytes)
+            if index_ready:
+                candidates = self.search_index.candidates(query_tokens, project)
+        
+        # Without the index, gate each file on its raw bytes like the exact
+        # match stage does, so files with none of the tokens aren't decoded
+        token_pattern = _literal_pattern(query_tokens) if candidates is None else None
+        
+        if candidates is not None:
+            archive_files = [entry for entry in archive_files if entry[2] in candidates]
+        
+        # Tokens are already lowercase; repeated ones only count once
+        unique_tokens = set(query_tokens)
+        
+        # Search each file
+        def score_file(proj: str, section: str, file_path: str) -> Optional[Dict[str, Any]]:
+            content = _read_searchable(file_path, max_bytes, token_pattern)
+            if content is None:
+                return None
             
-            if not os.path.exists(project_dir):
-                continue
+            # Score document based on token matches
+            content_lower = content.lower()
+            score, positions = _score_lowercase(query_tokens, content_lower)
             
-            # Search all sections
-            for section_dir in glob.glob(os.path.join(project_dir, "*")):
-                if not os.path.isdir(section_dir):
-                    continue
-                
-                section = os.path.basename(section_dir)
-                
-                # Search all files in the section
-                for file_path in glob.glob(os.path.join(section_dir, "*.md")):
-                    with open(file_path, 'r') as f:
-                        content = f.read()
-                    
-                    # Score document based on token matches
-                    score, positions = score_document(query_tokens, content)
-                    
-                    if score > 0:
-                        # Extract the best snippet (we'll use the first match position)
-                        if positions:
-                            match_pos = positions[0]
-                            start = max(0, match_pos - 100)
-                            end = min(len(content), match_pos + 200)
-                            snippet = content[start:end]
-                        else:
-                            # Fallback to beginning of document
-                            snippet = content[:300]
-                        
-                        # Extract title from first line or filename
-                        first_line = content.split('\n', 1)[0]
-                        title = first_line.lstrip('#').strip() if first_line.startswith('#') else os.path.basename(file_path)
-                        
-                        results.append({
-                            'project': proj,
-                            'section': section,
-                            'file': file_path,
-                            'title': title,
-                            'snippet': snippet,
-                            'score': score,
-                            'matched_tokens': len(set(token for token in query_tokens if token.lower() in content.lower()))
-                        })
+            if score <= 0:
+                return None
+            
+            # Extract the best snippet (we'll use the first match position)
+            if positions:
+                match_pos = positions[0]
+                start = max(0, match_pos - 100)
+                end = min(len(content), match_pos + 200)
+                snippet = content[start:end]
+            else:
+                # Fallback to beginning of document
+                snippet = content[:300]
+            
+            # Extract title from first line or filename
+            title = _extract_title(content, file_path)
+            
+            # Distinct tokens found anywhere in the content, even inside other words
+            matched_tokens = sum(1 for token in unique_tokens if token in content_lower)
+            
+            return {
+                'project': proj,
+                'section': section,
+                'file': file_path,
+                'title': title,
+                'snippet': snippet,
+                'score': score,
+                'matched_tokens': matched_tokens
+            }
+        
+        results = [entry for entry in _map_files(score_file, archive_files) if entry is not None]
         
         # Sort results by score (highest first)
         results.sort(key=lambda x: (x['score'], x['matched_tokens']), reverse=True)
@@ -382,53 +974,70 @@ class ArchivesManager:
         Returns:
             List of matching entries
         """
-        results = []
-        
-        # Determine which projects to search
-        if project:
-            projects = [project]
-        else:
-            projects = self.config["settings"]["archive_structure"]["projects"]
+        return self._exact_match_search_many([query], project)[query]
+    
+    def _exact_match_search_many(self, queries: List[str], project: Optional[str] = None,
+                                 archive_files: Optional[List[Tuple[str, str, str]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Perform an exact string match search for several queries in one pass.
         
-        # Search each project
-        for proj in projects:
-            project_dir = os.path.join(self.data_archives_dir, proj)
+        Args:
+            queries: Search queries
+            project: Optional project to limit the search to
+            archive_files: Archive files to search, if the caller already listed them
             
-            if not os.path.exists(project_dir):
-                continue
+        Returns:
+            Dictionary mapping each query to its list of matching entries
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {query: [] for query in queries}
+        queries_lower = [(query, query.lower()) for query in results]
+        
+        # Compile the queries into one pattern matched on the raw file bytes,
+        # so files without a hit for any of them are never decoded
+        query_pattern = _literal_pattern(list(results))
+        
+        if archive_files is None:
+            archive_files = self._list_archive_files(self._search_projects(project))
+        
+        # Skip oversized files (e.g. logs copied into the archives)
+        max_bytes = self._search_max_bytes()
+        
+        # Search each file
+        def search_file(proj: str, section: str, file_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+            content = _read_searchable(file_path, max_bytes, query_pattern)
+            if content is None:
+                return []
             
-            # Search all sections
-            for section_dir in glob.glob(os.path.join(project_dir, "*")):
-                if not os.path.isdir(section_dir):
+            # Simple search for exact match
+            lower_content = content.lower()
+            title = None
+            hits = []
+            for query, query_lower in queries_lower:
+                query_pos = lower_content.find(query_lower)
+                if query_pos == -1:
                     continue
                 
-                section = os.path.basename(section_dir)
+                # Extract a snippet around the query
+                start = max(0, query_pos - 100)
+                end = min(len(content), query_pos + len(query) + 100)
+                snippet = content[start:end]
                 
-                # Search all files in the section
-                for file_path in glob.glob(os.path.join(section_dir, "*.md")):
-                    with open(file_path, 'r') as f:
-                        content = f.read()
-                    
-                    # Simple search for exact match
-                    if query.lower() in content.lower():
-                        # Extract a snippet around the query
-                        lower_content = content.lower()
-                        query_pos = lower_content.find(query.lower())
-                        start = max(0, query_pos - 100)
-                        end = min(len(content), query_pos + len(query) + 100)
-                        snippet = content[start:end]
-                        
-                        # Extract title from first line or filename
-                        first_line = content.split('\n', 1)[0]
-                        title = first_line.lstrip('#').strip() if first_line.startswith('#') else os.path.basename(file_path)
-                        
-                        results.append({
-                            'project': proj,
-                            'section': section,
-                            'file': file_path,
-                            'title': title,
-                            'snippet': snippet
-                        })
+                # Extract title from first line or filename
+                if title is None:
+                    title = _extract_title(content, file_path)
+                
+                hits.append((query, {
+                    'project': proj,
+                    'section': section,
+                    'file': file_path,
+                    'title': title,
+                    'snippet': snippet
+                }))
+            return hits
+        
+        for hits in _map_files(search_file, archive_files):
+            for query, entry in hits:
+                results[query].append(entry)
         
         return results
     
@@ -450,82 +1059,73 @@ class ArchivesManager:
         # Save to root directory
         rule_file = os.path.join(self.repo_root, rule_name)
         
-        with open(rule_file, 'w') as f:
+        # Leave the file (and its mtime) alone if the rule is unchanged
+        if _read_rule_if_exists(rule_file) == rule_content:
+            return rule_file
+        
+        with _atomic_write(rule_file) as f:
             f.write(rule_content)
         
         return rule_file
     
-    def get_custom_rules(self) -> List[Dict[str, str]]:
+    def _iter_custom_rule_files(self):
         """
-        Get all custom rules from the archives.
+        Iterate over the custom rule files without reading them.
         
-        Returns:
-            List of dictionaries with 'name', 'file', and 'content' for each rule
+        Rules are yielded in priority order; a rule name found in a higher
+        priority location shadows files with the same name further down.
+        
+        Yields:
+            Tuples of (rule_name, rule_file)
         """
-        rules = []
-        rules_by_name = {}  # Track rules by name to handle duplicates
+        seen = set()  # Track rules by name to handle duplicates
         
         # Priority 1: Check for custom rules in the repo root directory (highest priority)
-        repo_root_custom_rules = os.path.join(self.repo_root, "*.md")
-        for rule_file in glob.glob(repo_root_custom_rules):
+        for rule_file in _list_entries(self.repo_root, '.md'):
             rule_name = os.path.splitext(os.path.basename(rule_file))[0]
             
             # Only consider .md files that are likely to be custom rules
             if rule_name.lower() in ['custom-rules', 'ai_archives_integration', 'archives_integration', 'explicit_permission']:
-                with open(rule_file, 'r') as f:
-                    content = f.read()
-                
-                rules_by_name[rule_name] = {
-                    'name': rule_name,
-                    'file': rule_file,
-                    'content': content
-                }
+                seen.add(rule_name)
+                yield rule_name, rule_file
         
         # Priority 2: Check in data_path for custom rules (for backward compatibility)
-        data_path_custom_rules = os.path.join(self.data_path, "*.md")
-        for rule_file in glob.glob(data_path_custom_rules):
-            rule_name = os.path.splitext(os.path.basename(rule_file))[0]
-            
-            # Skip if we already have this rule from repo root
-            if rule_name in rules_by_name:
-                continue
-                
-            with open(rule_file, 'r') as f:
-                content = f.read()
-            
-            rules_by_name[rule_name] = {
-                'name': rule_name,
-                'file': rule_file,
-                'content': content
-            }
-        
         # Priority 3: Check for custom rules in previous locations (backwards compatibility)
         # Legacy locations to check in order from highest to lowest priority:
-        legacy_locations = [
+        locations = [
+            self.data_path,
             os.path.join(self.data_path, 'custom_rules'),  # Old data path location
             os.path.join(self.archives_dir, 'custom_rules')  # Old archives location
         ]
         
-        for legacy_dir in legacy_locations:
-            if os.path.exists(legacy_dir):
-                for rule_file in glob.glob(os.path.join(legacy_dir, "*.md")):
-                    rule_name = os.path.splitext(os.path.basename(rule_file))[0]
-                    
-                    # Skip if we already have this rule from another source
-                    if rule_name in rules_by_name:
-                        continue
-                    
-                    with open(rule_file, 'r') as f:
-                        content = f.read()
-                    
-                    rules_by_name[rule_name] = {
-                        'name': rule_name,
-                        'file': rule_file,
-                        'content': content
-                    }
-        
-        # Convert dictionary to list
-        return list(rules_by_name.values())
+        for location in locations:
+            for rule_file in _list_entries(location, '.md'):
+                rule_name = os.path.splitext(os.path.basename(rule_file))[0]
+                
+                # Skip if we already have this rule from another source
+                if rule_name in seen:
+                    continue
+                
+                seen.add(rule_name)
+                yield rule_name, rule_file
+    
+    def get_custom_rules(self) -> List[Dict[str, str]]:
+        """
+        Get all custom rules from the archives.
+        
+        Returns:
+            List of dictionaries with 'name', 'file', and 'content' for each rule
+        """
+        rules = []
+        
+        for rule_name, rule_file in self._iter_custom_rule_files():
+            rules.append({
+                'name': rule_name,
+                'file': rule_file,
+                'content': _read_rule(rule_file)
+            })
+        
+        return rules
     
     def generate_combined_cursorrules(self, output_path: Optional[str] = None) -> str:
         """
@@ -539,8 +1139,10 @@ class ArchivesManager:
         """
         from .github_integration import get_github_integration
         
-        # Get GitHub integration
-        github = get_github_integration()
+        # Get GitHub integration, caching the base file between runs
+        github = get_github_integration(
+            cache_path=os.path.join(self.data_archives_dir, '.github_cache.json')
+        )
         
         # Fetch base cursorrules file
         base_repo = self.config["settings"]["cursorrules"]["base_repo"]
@@ -561,57 +1163,56 @@ class ArchivesManager:
         
         print(f"Successfully fetched base cursorrules ({len(base_content)} characters)")
         
-        # Get custom rules
-        custom_rules = self.get_custom_rules()
+        # Get custom rules (only their paths; each rule is read while writing)
+        custom_rules = list(self._iter_custom_rule_files())
         
         # Merge with custom rules
         print(f"Merging with {len(custom_rules)} custom rules...")
         
+        pieces = [base_content]
         if custom_rules:
-            # Create custom rules section
-            combined_content = "\n\n# AI Archives - Custom Rules\n\n"
-            
             # Find AI Archives integration rules first
             archives_rule = None
             other_rules = []
             
             for rule in custom_rules:
-                rule_name_lower = rule['name'].lower()
+                rule_name_lower = rule[0].lower()
                 if rule_name_lower in ['ai_archives_integration', 'archives_integration', 'custom-rules']:
                     archives_rule = rule
                 else:
                     other_rules.append(rule)
             
-            # Add AI Archives integration rules first
-            if archives_rule:
-                combined_content += f"## {archives_rule['name']}\n\n"
-                combined_content += archives_rule['content'] + "\n\n"
-            
-            # Add other rules
-            for rule in other_rules:
-                combined_content += f"## {rule['name']}\n\n"
-                combined_content += rule['content'] + "\n\n"
-            
             # Combine with base content
-            if "# AI Archives - Custom Rules" not in base_content:
-                merged_content = base_content + combined_content
-            else:
+            if "# AI Archives - Custom Rules" in base_content:
                 parts = base_content.split("# AI Archives - Custom Rules")
-                merged_content = parts[0] + "# AI Archives - Custom Rules" + combined_content
+                pieces = [parts[0], "# AI Archives - Custom Rules"]
+            
+            # Create custom rules section
+            pieces.append("\n\n# AI Archives - Custom Rules\n\n")
+            
+            # Add AI Archives integration rules first, then the other rules
+            if archives_rule:
+                other_rules.insert(0, archives_rule)
         else:
-            merged_content = base_content
+            other_rules = []
         
         # Determine output path
         if not output_path:
             output_path = os.path.join(self.repo_root, '.cursorrules')
         
-        # Write to file
+        # Write to file, streaming one rule at a time
         print(f"Writing combined cursorrules to {output_path}...")
         
-        with open(output_path, 'w') as f:
-            f.write(merged_content)
+        written = 0
+        with _atomic_write(output_path) as out:
+            for piece in pieces:
+                written += out.write(piece)
+            
+            for rule_name, rule_file in other_rules:
+                written += out.write(f"## {rule_name}\n\n")
+                written += out.write(_read_rule(rule_file) + "\n\n")
         
-        print(f"Successfully wrote combined cursorrules file ({len(merged_content)} characters)")
+        print(f"Successfully wrote combined cursorrules file ({written} characters)")
         
         return output_path
     
@@ -636,10 +1237,12 @@ You are a powerful AI assistant working in Cursor. This is a .cursorrules file t
 """
 
 
+@functools.lru_cache(maxsize=4)
 def get_archives_manager(repo_root: str = None, data_repo_root: str = None, data_path: str = None) -> ArchivesManager:
     """
     Get an instance of the ArchivesManager.
     This is the main entry point for using the archives system.
+    Instances are shared between calls with the same arguments.
     
     Args:
         repo_root: Path to the repository root
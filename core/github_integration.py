@@ -9,24 +9,41 @@ pushing updates to the archives, and other GitHub-related functionality.
 import os
 import sys
 import json
+import tempfile
 import requests
 from typing import Optional, Dict, Any, List
 from base64 import b64decode
 from urllib.parse import urljoin
 
+# Use orjson for parsing the response cache when it's installed (optional dependency)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 class GitHubIntegration:
     """
     Class for handling GitHub integration with the AI Archives system.
     """
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, cache_path: Optional[str] = None):
         """
         Initialize the GitHub integration with an optional token.
         
         Args:
             token: GitHub API token. If None, tries to get from environment.
+            cache_path: Optional JSON file to cache fetched file contents in. Cached
+                        contents are revalidated with their ETag, so unchanged files
+                        cost a 304 response instead of a full download.
         """
+        self.cache_path = cache_path
+        self._cache = None
+        
+        # Reuse connections across requests
+        self._session = requests.Session()
+        
         self.token = token or os.environ.get('GITHUB_TOKEN')
         if not self.token:
             print("Warning: No GitHub token provided. Some features may be limited.")
@@ -40,7 +57,8 @@ class GitHubIntegration:
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
     
-    def fetch_file_content(self, owner: str, repo: str, path: str, ref: str = "main") -> Optional[str]:
+    def fetch_file_content(self, owner: str, repo: str, path: str, ref: str = "main",
+                           raw: bool = False) -> Optional[str]:
         """
         Fetch file content from a GitHub repository.
         
@@ -49,6 +67,9 @@ class GitHubIntegration:
             repo: Repository name
             path: Path to the file in the repository
             ref: Branch, tag, or commit SHA
+            raw: Ask for the raw file (application/vnd.github.raw+json) instead of
+                 the JSON document with base64 content. Raw responses are smaller
+                 and also work for files over 1 MB.
             
         Returns:
             File content as string, or None if not found
@@ -56,19 +77,90 @@ class GitHubIntegration:
         url = f"{self.api_base_url}/repos/{owner}/{repo}/contents/{path}"
         params = {"ref": ref}
         
-        response = requests.get(url, headers=self.headers, params=params)
+        headers = dict(self.headers)
+        if raw:
+            headers["Accept"] = "application/vnd.github.raw+json"
+        
+        # Revalidate a cached copy instead of downloading it again. Raw and JSON
+        # responses have different ETags, so they are cached separately.
+        cache_key = f"{url}@{ref}" + (":raw" if raw else "")
+        cached = self._load_cache().get(cache_key)
+        if not isinstance(cached, dict) or not isinstance(cached.get("content"), str):
+            # Missing or malformed entry
+            cached = None
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        response = self._session.get(url, headers=headers, params=params)
+        
+        if response.status_code == 304 and cached:
+            return cached["content"]
         
         if response.status_code != 200:
             print(f"Error fetching file: {response.status_code} {response.reason}")
             print(response.text)
             return None
         
-        data = response.json()
-        if "content" in data:
-            # Content is base64 encoded
-            return b64decode(data["content"]).decode('utf-8')
-        
-        return None
+        if response.headers.get("Content-Type", "").startswith("application/json"):
+            # Not a raw file (e.g. a directory listing); content, if any, is base64 encoded
+            data = response.json()
+            if not isinstance(data, dict) or "content" not in data:
+                return None
+            content = b64decode(data["content"]).decode('utf-8')
+        else:
+            content = response.content.decode('utf-8')
+        
+        if self.cache_path and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            self._cache[cache_key] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content": content
+            }
+            self._save_cache()
+        
+        return content
+    
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load the response cache from disk on first use."""
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path:
+                try:
+                    with open(self.cache_path, 'rb') as f:
+                        cache = _loads(f.read())
+                except (OSError, ValueError):
+                    cache = None
+                
+                # A corrupt or foreign file is treated as an empty cache
+                if isinstance(cache, dict):
+                    self._cache = cache
+        return self._cache
+    
+    def _save_cache(self) -> None:
+        """Write the response cache to disk, replacing the old file atomically."""
+        try:
+            cache_dir = os.path.dirname(os.path.abspath(self.cache_path))
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.github_cache.')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self._cache, f)
+                    
+                    # Make sure the data is on disk before the rename can be
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.cache_path)
+            except BaseException:
+                # Don't leave the temporary file behind, whatever went wrong
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"Warning: Could not write GitHub cache: {e}")
     
     def fetch_base_cursorrules(self, repo: str, branch: str, file_path: str) -> Optional[str]:
         """
@@ -93,7 +185,8 @@ class GitHubIntegration:
         except ValueError:
             raise ValueError(f"Invalid repository format: {repo}. Expected format: 'owner/repo'")
         
-        return self.fetch_file_content(owner, repo_name, file_path, branch)
+        # Only the file itself is needed, so skip the base64 JSON wrapper
+        return self.fetch_file_content(owner, repo_name, file_path, branch, raw=True)
     
     def create_or_update_file(self, owner: str, repo: str, path: str, 
                              content: str, message: str, branch: str = "main",
@@ -134,7 +227,7 @@ class GitHubIntegration:
         if sha:
             data["sha"] = sha
         
-        response = requests.put(url, headers=self.headers, json=data)
+        response = self._session.put(url, headers=self.headers, json=data)
         
         if response.status_code not in (200, 201):
             print(f"Error creating/updating file: {response.status_code} {response.reason}")
@@ -159,7 +252,7 @@ class GitHubIntegration:
         url = f"{self.api_base_url}/repos/{owner}/{repo}/contents/{path}"
         params = {"ref": ref}
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._session.get(url, headers=self.headers, params=params)
         
         return response.status_code == 200
     
@@ -179,7 +272,7 @@ class GitHubIntegration:
         url = f"{self.api_base_url}/repos/{owner}/{repo}/contents/{path}"
         params = {"ref": ref}
         
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self._session.get(url, headers=self.headers, params=params)
         
         if response.status_code != 200:
             return {}
@@ -214,7 +307,7 @@ class GitHubIntegration:
             "base": base
         }
         
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self._session.post(url, headers=self.headers, json=data)
         
         if response.status_code != 201:
             print(f"Error creating pull request: {response.status_code} {response.reason}")
@@ -225,17 +318,19 @@ class GitHubIntegration:
 
 
 # Helper function to get an instance of the GitHub integration
-def get_github_integration(token: Optional[str] = None) -> GitHubIntegration:
+def get_github_integration(token: Optional[str] = None,
+                           cache_path: Optional[str] = None) -> GitHubIntegration:
     """
     Get an instance of the GitHubIntegration.
     
     Args:
         token: Optional GitHub API token
+        cache_path: Optional JSON file to cache fetched file contents in
         
     Returns:
         GitHubIntegration instance
     """
-    return GitHubIntegration(token)
+    return GitHubIntegration(token, cache_path)
 
 
 if __name__ == "__main__":
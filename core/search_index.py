@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Search Index for AI Archives
+
+This module keeps a SQLite FTS5 full-text index of the archive files so that
+searches only need to read the files that can possibly match, instead of
+rescanning every file for every query.
+"""
+
+import io
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Bumped whenever the tables change; older databases are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+# What _index_file recorded for a file (files.indexed)
+TOO_LARGE = 0  # Over max_bytes; read once a larger limit allows it
+INDEXED = 1
+BINARY = 2     # NUL byte in the first 4 KiB; skipped until the file changes
+
+# Characters the search doesn't treat as part of a word (str.isalnum is false)
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+# SQLite errors that mean the index can't work at all (no FTS5 module, or a
+# database file that can't be opened or isn't one). Other errors, such as
+# "database is locked" while another process refreshes it, are transient.
+FATAL_ERRORS = ('no such module', 'unable to open database', 'file is not a database', 'malformed')
+
+
+def _words(text: str) -> str:
+    """
+    Lowercase text and replace everything but letters and digits with spaces.
+
+    This is what the index stores instead of the raw body, and what tokens are
+    looked up as. unicode61 would otherwise split and fold words differently
+    from the search, which lowercases with str.lower() and only treats
+    str.isalnum() characters as part of a word: it keeps private-use
+    characters inside words, and folds 'İ' to 'i' where str.lower() gives
+    'i' plus a combining dot. With every separator already a space, any token
+    the search finds as a whole word is a whole word for unicode61 too.
+    """
+    return NON_WORD_PATTERN.sub(' ', text.lower())
+
+
+class SearchIndex:
+    """
+    Full-text index of archive files, stored in a SQLite database.
+
+    The index is only used to narrow down candidate files; callers still score
+    the candidates themselves so results are the same as a full scan. If SQLite
+    was built without FTS5 or the database can't be opened, the index disables
+    itself and callers fall back to scanning every file.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the index. The database is opened on first use.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self.available = True
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the tables if needed."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.executescript("""
+                        DROP TABLE IF EXISTS archives;
+                        DROP TABLE IF EXISTS files;
+                    """)
+
+                conn.executescript(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS archives
+                        USING fts5(project, section, title, body, path UNINDEXED, tokenize='unicode61');
+                    CREATE TABLE IF NOT EXISTS files (
+                        path TEXT PRIMARY KEY,
+                        project TEXT NOT NULL,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        indexed INTEGER NOT NULL
+                    );
+                    PRAGMA user_version = {SCHEMA_VERSION};
+                """)
+            except sqlite3.Error:
+                # Don't leak the connection; the next call opens a new one
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def _delete_file(self, conn: sqlite3.Connection, path: str) -> None:
+        """Remove a file from the index inside the current transaction."""
+        conn.execute("DELETE FROM archives WHERE path = ?", (path,))
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _index_file(self, conn: sqlite3.Connection, project: str, section: str,
+                    path: str, st: os.stat_result, max_bytes: int) -> None:
+        """
+        (Re)index a single file inside the current transaction.
+
+        Files the search skips anyway (larger than max_bytes, or binary: a NUL
+        byte in the first 4 KiB) are only recorded in the files table, as
+        TOO_LARGE or BINARY, so they are neither read in full nor stored in
+        the database.
+        """
+        self._delete_file(conn, path)
+
+        content = None
+        if st.st_size > max_bytes:
+            status = TOO_LARGE
+        else:
+            with open(path, 'rb') as f:
+                if b'\x00' in f.peek(4096)[:4096]:
+                    status = BINARY
+                else:
+                    with io.TextIOWrapper(f, errors='replace') as text:
+                        content = text.read()
+                    status = INDEXED
+
+        if content is not None:
+            end = content.find('\n')
+            first_line = content if end == -1 else content[:end]
+            title = first_line.lstrip('#').strip() if first_line.startswith('#') else os.path.basename(path)
+
+            conn.execute(
+                "INSERT INTO archives (project, section, title, body, path) VALUES (?, ?, ?, ?, ?)",
+                (project, section, title, _words(content), path)
+            )
+
+        conn.execute(
+            "INSERT OR REPLACE INTO files (path, project, mtime_ns, size, indexed) VALUES (?, ?, ?, ?, ?)",
+            (path, project, st.st_mtime_ns, st.st_size, status)
+        )
+
+    def refresh(self, files: Iterable[Tuple[str, str, str]], projects: Iterable[str],
+                max_bytes: int) -> bool:
+        """
+        Bring the index up to date with the files currently on disk.
+
+        Only files whose mtime or size changed since they were indexed are read,
+        plus files skipped as TOO_LARGE that max_bytes now allows. Binary files
+        are not looked at again until they change. Indexed files of the given
+        projects that no longer exist are dropped.
+
+        Args:
+            files: (project, section, path) for every archive file in scope
+            projects: Projects covered by `files`
+            max_bytes: Largest file size the search reads (see _index_file)
+
+        Returns:
+            True if the index is usable
+        """
+        if not self.available:
+            return False
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                project_list = list(projects)
+                placeholders = ','.join('?' * len(project_list))
+                indexed: Dict[str, Tuple[int, int, int]] = {
+                    path: (mtime_ns, size, status)
+                    for path, mtime_ns, size, status in conn.execute(
+                        f"SELECT path, mtime_ns, size, indexed FROM files WHERE project IN ({placeholders})",
+                        project_list
+                    )
+                }
+
+                with conn:
+                    for project, section, path in files:
+                        known = indexed.pop(path, None)
+                        try:
+                            st = os.stat(path)
+                            if known is None or known[:2] != (st.st_mtime_ns, st.st_size) or \
+                               (known[2] == TOO_LARGE and st.st_size <= max_bytes):
+                                self._index_file(conn, project, section, path, st, max_bytes)
+                        except FileNotFoundError:
+                            # Deleted since it was listed; drop it like the others below
+                            if known is not None:
+                                indexed[path] = known
+
+                    # Whatever is left was indexed before but is gone now
+                    for path in indexed:
+                        self._delete_file(conn, path)
+            return True
+        except (sqlite3.Error, OSError) as e:
+            self._handle_error(e)
+            return False
+
+    def candidates(self, tokens: List[str], project: Optional[str] = None) -> Optional[Set[str]]:
+        """
+        Get the files that contain at least one of the tokens.
+
+        Args:
+            tokens: Search tokens (as produced by tokenize())
+            project: Optional project to limit the lookup to
+
+        Returns:
+            Set of file paths, or None if the index is unavailable
+        """
+        if not self.available or not tokens:
+            return None
+
+        # Quote every token so it's matched as a phrase and never parsed as FTS syntax.
+        # Tokens are split into words the same way as the stored bodies.
+        match = ' OR '.join('"{}"'.format(_words(token).replace('"', '""')) for token in tokens)
+        sql = "SELECT path FROM archives WHERE archives MATCH ?"
+        params: list = [match]
+        if project:
+            sql += " AND project = ?"
+            params.append(project)
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                return {row[0] for row in conn.execute(sql, params)}
+        except sqlite3.Error as e:
+            self._handle_error(e)
+            return None
+
+    def _handle_error(self, e: Exception) -> None:
+        """
+        Report an error from the database or an archive file.
+
+        The index is only disabled for good on errors in FATAL_ERRORS; after
+        any other error the current search scans the files instead and the
+        next one tries the index again.
+        """
+        if isinstance(e, sqlite3.Error) and any(error in str(e) for error in FATAL_ERRORS):
+            print(f"Warning: Search index disabled: {e}")
+            self.available = False
+        else:
+            print(f"Warning: Search index not used for this search: {e}")
+
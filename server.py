@@ -248,8 +248,13 @@ def list_sections():
         return jsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
-    # Get port from environment or use default
-    port = int(os.environ.get('PORT', 5000))
+    import argparse
+    
+    # Get port from --port, then the environment, then the default
+    parser = argparse.ArgumentParser(description="AI Archives REST API Server")
+    parser.add_argument("--port", type=int, default=int(os.environ.get('PORT', 5000)),
+                        help="Port to run the server on (default: $PORT or 5000)")
+    args = parser.parse_args()
     
     # Run with 0.0.0.0 to make it externally visible if needed
-    app.run(host='0.0.0.0', port=port, debug=True) 
\ No newline at end of file
+    app.run(host='0.0.0.0', port=args.port, debug=True) 
\ No newline at end of file
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch command of the ai_archives wrapper.
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+
+import ai_archives
+
+
+class FakeClient:
+    """Records the calls the batch command makes instead of sending them."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def add(self, project, section, content, title=None):
+        with self._lock:
+            self.calls.append(('add', project, section, content, title))
+        return {'file': f'{project}/{section}.md'}
+
+    def add_rule(self, name, content):
+        with self._lock:
+            self.calls.append(('rule-add', name, content))
+        return {'file': f'{name}.md'}
+
+
+class BatchTest(unittest.TestCase):
+    """run_batch sends every record and reports failures per record."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.client = FakeClient()
+        patcher = mock.patch.object(ai_archives, '_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_batch(self, **kwargs):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = ai_archives.run_batch(**kwargs)
+        return code, output.getvalue()
+
+    def write_jsonl(self, lines):
+        path = os.path.join(self.tmp_dir, 'batch.jsonl')
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def test_records_are_sent_in_order_per_section(self):
+        records = [
+            {"command": "add", "args": {"project": "shared", "section": "setup",
+                                        "content": f"entry {i}", "title": f"Entry {i}"}}
+            for i in range(20)
+        ]
+        records.append({"command": "rule-add", "args": {"name": "my-rule", "content": "Be nice"}})
+        code, output = self.run_batch(path=self.write_jsonl(json.dumps(r) for r in records))
+
+        self.assertEqual(code, 0)
+        self.assertIn("Processed 21 records (0 failed)", output)
+        adds = [call for call in self.client.calls if call[0] == 'add']
+        self.assertEqual([call[3] for call in adds], [f"entry {i}" for i in range(20)])
+        self.assertIn(('rule-add', 'my-rule', 'Be nice'), self.client.calls)
+
+    def test_malformed_records_fail_on_their_own(self):
+        lines = [
+            json.dumps({"command": "add", "args": {"project": "shared", "section": "setup", "content": "ok"}}),
+            json.dumps(["not", "an", "object"]),
+            json.dumps({"command": "add", "args": "not an object"}),
+            json.dumps({"command": "delete", "args": {}}),
+        ]
+        code, output = self.run_batch(path=self.write_jsonl(lines))
+
+        self.assertEqual(code, 1)
+        self.assertIn("1. OK shared/setup.md", output)
+        self.assertIn("2. Error: record must be a JSON object", output)
+        self.assertIn("3. Error: record must be a JSON object", output)
+        self.assertIn("4. Error: Unsupported batch command: delete", output)
+        self.assertIn("Processed 4 records (3 failed)", output)
+        self.assertEqual(len(self.client.calls), 1)
+
+    def test_unreadable_input_is_an_error(self):
+        code, output = self.run_batch(path=self.write_jsonl(['{not json']))
+        self.assertEqual(code, 1)
+        self.assertIn("Error reading batch input", output)
+        self.assertEqual(self.client.calls, [])
+
+    def test_from_dir_adds_every_markdown_file(self):
+        root = os.path.join(self.tmp_dir, 'import')
+        for project, section, name in [('shared', 'setup', 'a.md'), ('shared', 'setup', 'b.md'),
+                                        ('backend', 'errors', 'c.md'), ('backend', 'errors', 'notes.txt')]:
+            os.makedirs(os.path.join(root, project, section), exist_ok=True)
+            with open(os.path.join(root, project, section, name), 'w') as f:
+                f.write(f"content of {name}")
+
+        code, output = self.run_batch(from_dir=root)
+
+        self.assertEqual(code, 0)
+        self.assertEqual(sorted(call[1:4] for call in self.client.calls), [
+            ('backend', 'errors', 'content of c.md'),
+            ('shared', 'setup', 'content of a.md'),
+            ('shared', 'setup', 'content of b.md'),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
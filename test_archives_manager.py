@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for writing to the archives through the ArchivesManager.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+
+from core import archives_manager
+from core.archives_manager import ArchivesManager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class ArchivesManagerTestCase(unittest.TestCase):
+    """Creates an ArchivesManager with its own data directory."""
+
+    def setUp(self):
+        self.data_path = tempfile.mkdtemp()
+        self.manager = ArchivesManager(data_path=self.data_path)
+        self.section_dir = os.path.join(self.manager.data_archives_dir, 'shared', 'setup')
+
+    def tearDown(self):
+        shutil.rmtree(self.data_path)
+
+    def read(self, path: str) -> str:
+        with open(path, 'r') as f:
+            return f.read()
+
+
+class BulkAppendTest(ArchivesManagerTestCase):
+    """Entries are appended to the newest archive file of a section."""
+
+    def test_bulk_append_matches_add_to_archives(self):
+        with self.manager.bulk_append('shared', 'setup') as append:
+            path = append("first entry", "First")
+            self.assertEqual(append("second entry"), path)
+            self.assertEqual(append("third entry", "Third"), path)
+
+        self.assertEqual(self.read(path),
+                         "# First\n\nfirst entry"
+                         "\n\n---\n\nsecond entry"
+                         "\n\n---\n\n## Third\n\nthird entry")
+
+        self.assertEqual(self.manager.add_to_archives('shared', 'setup', "fourth entry", "Fourth"), path)
+        self.assertTrue(self.read(path).endswith("\n\n---\n\n## Fourth\n\nfourth entry"))
+
+    def test_new_file_gets_no_header_if_another_writer_filled_it(self):
+        path = os.path.join(self.section_dir, 'shared_setup_20250101_000000.md')
+        os.makedirs(self.section_dir)
+        with open(path, 'w') as f:
+            f.write("# Existing\n\nfirst entry")
+
+        # As if another writer appended between creating the file and opening it
+        with mock.patch.object(ArchivesManager, 'get_appropriate_archive_file', return_value=(path, True)):
+            self.manager.add_to_archives('shared', 'setup', "second entry", "Second")
+
+        self.assertEqual(self.read(path), "# Existing\n\nfirst entry\n\n---\n\n## Second\n\nsecond entry")
+
+    def test_empty_file_gets_the_header(self):
+        # Created by another writer that hasn't written its first entry yet
+        os.makedirs(self.section_dir)
+        path = os.path.join(self.section_dir, 'shared_setup_20250101_000000.md')
+        open(path, 'w').close()
+
+        self.assertEqual(self.manager.add_to_archives('shared', 'setup', "first entry", "First"), path)
+        self.assertEqual(self.read(path), "# First\n\nfirst entry")
+
+    @unittest.skipIf(fcntl is None, "archive files are only locked where fcntl is available")
+    def test_concurrent_appends_wait_for_the_file_lock(self):
+        path = self.manager.add_to_archives('shared', 'setup', "first entry", "First")
+        started = threading.Event()
+
+        def add_batch():
+            with self.manager.bulk_append('shared', 'setup') as append:
+                append("batch entry 1")
+                started.set()
+                time.sleep(0.2)
+                append("batch entry 2")
+
+        batch = threading.Thread(target=add_batch)
+        batch.start()
+        started.wait()
+        # Blocks until the batch releases the file, so the batch stays together
+        self.manager.add_to_archives('shared', 'setup', "single entry")
+        batch.join()
+
+        self.assertEqual(self.read(path).split("\n\n---\n\n"),
+                         ["# First\n\nfirst entry", "batch entry 1", "batch entry 2", "single entry"])
+
+class NewArchiveFileTest(ArchivesManagerTestCase):
+    """New archive files never replace each other."""
+
+    def test_same_second_files_get_a_suffix(self):
+        # Every call starts a new file in the same second, as concurrent
+        # writers that all found the section empty would
+        with mock.patch.object(archives_manager, '_scan_entries', side_effect=lambda *args: iter(())), \
+             mock.patch.object(archives_manager.time, 'strftime', return_value='20250101_000000'):
+            paths = [self.manager.get_appropriate_archive_file('shared', 'setup') for _ in range(3)]
+
+        base = os.path.join(self.section_dir, 'shared_setup_20250101_000000')
+        self.assertEqual(paths, [(f"{base}.md", True), (f"{base}_1.md", True), (f"{base}_2.md", True)])
+        self.assertTrue(all(os.path.getsize(path) == 0 for path, _ in paths))
+
+    def test_existing_file_is_reused(self):
+        path, is_new = self.manager.get_appropriate_archive_file('shared', 'setup')
+        self.assertTrue(is_new)
+        self.assertEqual(self.manager.get_appropriate_archive_file('shared', 'setup'), (path, False))
+
+
+class AtomicWriteTest(unittest.TestCase):
+    """_atomic_write replaces a file in one step or not at all."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, '.cursorrules')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_replaces_the_file_and_keeps_its_mode(self):
+        with open(self.path, 'w') as f:
+            f.write("old")
+        os.chmod(self.path, 0o640)
+
+        with archives_manager._atomic_write(self.path) as f:
+            f.write("new")
+
+        with open(self.path, 'r') as f:
+            self.assertEqual(f.read(), "new")
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+        self.assertEqual(os.listdir(self.tmp_dir), ['.cursorrules'])
+
+    def test_new_file_gets_the_default_mode(self):
+        umask = os.umask(0o022)
+        try:
+            with archives_manager._atomic_write(self.path) as f:
+                f.write("new")
+        finally:
+            os.umask(umask)
+
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+    def test_failed_write_leaves_the_old_file(self):
+        with open(self.path, 'w') as f:
+            f.write("old")
+
+        with self.assertRaises(RuntimeError):
+            with archives_manager._atomic_write(self.path) as f:
+                f.write("partial")
+                raise RuntimeError("write failed")
+
+        with open(self.path, 'r') as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.tmp_dir), ['.cursorrules'])
+
+if __name__ == "__main__":
+    unittest.main()
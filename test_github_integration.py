@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the ETag cache of the GitHub integration.
+"""
+
+import os
+import sys
+import json
+import base64
+import shutil
+import tempfile
+import unittest
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+
+from core.github_integration import GitHubIntegration
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.reason = "OK" if status_code == 200 else "Not Modified"
+        self.text = content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    """Answers like the contents API for a single file with a fixed ETag."""
+
+    def __init__(self, content, etag='"v1"'):
+        self.file_content = content
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, params=None):
+        self.requests.append(headers)
+        if headers.get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        if headers.get("Accept") == "application/vnd.github.raw+json":
+            return FakeResponse(200, self.file_content.encode('utf-8'),
+                                {"ETag": self.etag, "Content-Type": "application/vnd.github.raw+json"})
+        body = {"content": base64.b64encode(self.file_content.encode('utf-8')).decode('ascii')}
+        return FakeResponse(200, json.dumps(body).encode('utf-8'),
+                            {"ETag": self.etag + "-json", "Content-Type": "application/json; charset=utf-8"})
+
+
+class GitHubCacheTest(unittest.TestCase):
+    """Fetched files are cached on disk and revalidated by ETag."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, '.github_cache.json')
+        self.session = FakeSession("# Base rules\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def integration(self):
+        github = GitHubIntegration(token="test-token", cache_path=self.cache_path)
+        github._session = self.session
+        return github
+
+    def fetch(self):
+        return self.integration().fetch_base_cursorrules("owner/repo", "main", ".cursorrules")
+
+    def test_second_fetch_is_revalidated(self):
+        self.assertEqual(self.fetch(), "# Base rules\n")
+        self.assertNotIn("If-None-Match", self.session.requests[0])
+
+        # A new instance reads the cache from disk and gets a 304
+        self.assertEqual(self.fetch(), "# Base rules\n")
+        self.assertEqual(self.session.requests[1]["If-None-Match"], '"v1"')
+        self.assertEqual(os.listdir(self.tmp_dir), ['.github_cache.json'])
+
+    def test_changed_file_is_downloaded_again(self):
+        self.fetch()
+        self.session.file_content = "# New rules\n"
+        self.session.etag = '"v2"'
+        self.assertEqual(self.fetch(), "# New rules\n")
+        self.assertEqual(self.fetch(), "# New rules\n")
+        self.assertEqual(self.session.requests[2]["If-None-Match"], '"v2"')
+
+    def test_raw_media_type_is_only_used_for_the_base_file(self):
+        self.fetch()
+        self.assertEqual(self.session.requests[0]["Accept"], "application/vnd.github.raw+json")
+
+        content = self.integration().fetch_file_content("owner", "repo", ".cursorrules", "main")
+        self.assertEqual(content, "# Base rules\n")
+        self.assertEqual(self.session.requests[1]["Accept"], "application/vnd.github+json")
+
+    def test_corrupt_cache_is_ignored(self):
+        for corrupt in ('not json', '[1, 2, 3]',
+                        '{"https://api.github.com/repos/owner/repo/contents/.cursorrules@main:raw": "not an entry"}'):
+            with self.subTest(cache=corrupt):
+                with open(self.cache_path, 'w') as f:
+                    f.write(corrupt)
+                self.assertEqual(self.fetch(), "# Base rules\n")
+                with open(self.cache_path, 'r') as f:
+                    self.assertIsInstance(json.load(f), dict)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite full-text index that narrows down search candidates.
+"""
+
+import io
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+# Add parent directory to path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+
+from core.archives_manager import ArchivesManager
+
+
+class SearchIndexTest(unittest.TestCase):
+    """Search results must be the same with and without the index."""
+
+    def setUp(self):
+        self.data_path = tempfile.mkdtemp()
+        self.manager = ArchivesManager(data_path=self.data_path)
+        self.section_dir = os.path.join(self.manager.data_archives_dir, 'shared', 'setup')
+
+    def tearDown(self):
+        shutil.rmtree(self.data_path)
+
+    def write_archive(self, name: str, content: str) -> str:
+        os.makedirs(self.section_dir, exist_ok=True)
+        path = os.path.join(self.section_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def scan(self, query: str):
+        """Tokenized search with the index switched off."""
+        available = self.manager.search_index.available
+        self.manager.search_index.available = False
+        try:
+            return self.manager._tokenized_search(query)
+        finally:
+            self.manager.search_index.available = available
+
+    def test_indexed_search_matches_full_scan(self):
+        self.write_archive('ascii.md', "# Setup\n\nRun the installer, then restart.\n")
+        # str.isalnum() is false for private-use characters and the combining
+        # dot str.lower() adds to 'İ', so the search sees word boundaries
+        # there that unicode61 doesn't
+        self.write_archive('private_use.md', "# Notes\n\nfoo\ue000 and bar\n")
+        self.write_archive('dotted_i.md', "# Trip\n\nzz İstanbul\n")
+        self.write_archive('mixed.md', "# Mixed\n\ncafé — naïve foo_bar\n")
+
+        queries = ['installer', 'foo', 'stanbul', 'istanbul', 'zz', 'caf', 'cafe',
+                   'foo_bar', 'bar', 'na ve', 'restart installer']
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual(self.manager._tokenized_search(query), self.scan(query))
+        self.assertTrue(self.manager.search_index.available)
+
+    def test_index_is_used_for_ascii_tokens(self):
+        self.write_archive('private_use.md', "# Notes\n\nfoo\ue000 and bar\n")
+        self.write_archive('other.md', "# Other\n\nnothing here\n")
+        files = self.manager._list_archive_files(['shared'])
+        self.assertTrue(self.manager.search_index.refresh(files, ['shared'], 1 << 20))
+
+        candidates = self.manager.search_index.candidates(['foo'], 'shared')
+        self.assertEqual(candidates, {os.path.join(self.section_dir, 'private_use.md')})
+
+    def refresh(self) -> bool:
+        files = self.manager._list_archive_files(['shared'])
+        return self.manager.search_index.refresh(files, ['shared'], 1 << 20)
+
+    def test_refresh_follows_changes_on_disk(self):
+        path = self.write_archive('notes.md', "# Notes\n\nalpha\n")
+        self.assertTrue(self.refresh())
+        self.assertEqual(self.manager.search_index.candidates(['alpha']), {path})
+
+        self.write_archive('notes.md', "# Notes\n\nbeta and more\n")
+        self.assertTrue(self.refresh())
+        self.assertEqual(self.manager.search_index.candidates(['alpha']), set())
+        self.assertEqual(self.manager.search_index.candidates(['beta']), {path})
+
+        os.remove(path)
+        self.assertTrue(self.refresh())
+        self.assertEqual(self.manager.search_index.candidates(['beta']), set())
+
+    def test_refresh_skips_files_deleted_after_listing(self):
+        path = self.write_archive('notes.md', "# Notes\n\nalpha\n")
+        files = self.manager._list_archive_files(['shared'])
+        os.remove(path)
+
+        self.assertTrue(self.manager.search_index.refresh(files, ['shared'], 1 << 20))
+        self.assertEqual(self.manager.search_index.candidates(['alpha']), set())
+
+    def test_locked_database_only_skips_the_index_once(self):
+        self.write_archive('notes.md', "# Notes\n\nalpha\n")
+        index = self.manager.search_index
+        with mock.patch.object(index, '_index_file', side_effect=sqlite3.OperationalError('database is locked')), \
+             redirect_stdout(io.StringIO()):
+            self.assertFalse(self.refresh())
+        self.assertTrue(index.available)
+        self.assertTrue(self.refresh())
+
+    def test_corrupt_database_disables_the_index(self):
+        self.write_archive('notes.md', "# Notes\n\nalpha\n")
+        with open(self.manager.search_index.db_path, 'w') as f:
+            f.write('not a database' * 100)
+
+        with redirect_stdout(io.StringIO()):
+            self.assertFalse(self.refresh())
+        self.assertFalse(self.manager.search_index.available)
+        # Searches keep working without it
+        self.assertEqual(len(self.manager.search_archives('alpha')), 1)
+
+    def test_skipped_files_are_recorded_not_indexed(self):
+        binary = self.write_archive('binary.md', "# Binary\x00\nalpha\n")
+        large = self.write_archive('large.md', "# Large\n\nalpha " + "x" * 100)
+        index = self.manager.search_index
+        files = self.manager._list_archive_files(['shared'])
+
+        self.assertTrue(index.refresh(files, ['shared'], 64))
+        self.assertEqual(index.candidates(['alpha']), set())
+
+        # A larger limit indexes the large file; the binary one isn't read again
+        with mock.patch.object(index, '_index_file', wraps=index._index_file) as index_file:
+            self.assertTrue(index.refresh(files, ['shared'], 1 << 20))
+        self.assertEqual([call.args[3] for call in index_file.call_args_list], [large])
+        self.assertEqual(index.candidates(['alpha']), {large})
+        self.assertNotIn(binary, index.candidates(['binary']))
+
+    def test_search_many_matches_search_archives(self):
+        self.write_archive('setup.md', "# Setup\n\nRun the installer, then restart the server.\n")
+        self.write_archive('errors.md', "# Errors\n\nThe server fails to restart after an upgrade.\n")
+        self.write_archive('other.md', "# Other\n\nNothing to see.\n")
+
+        queries = ['restart', 'server restart', 'upgrade installer', 'missing', 'the server']
+        self.assertEqual(self.manager.search_many(queries),
+                         {query: self.manager.search_archives(query) for query in queries})
+
+
+if __name__ == "__main__":
+    unittest.main()